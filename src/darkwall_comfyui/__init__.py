@@ -17,7 +17,6 @@ from .config import (
 )
 # TEAM_006: ConfigV2 deleted - merged into Config
 from .prompt_generator import PromptGenerator
-from .comfy import ComfyClient, WorkflowManager
 from .wallpaper import WallpaperTarget
 from .schedule import ScheduleConfig, ThemeScheduler, ThemeResult  # TEAM_003: REQ-SCHED-002
 from .notifications import NotificationConfig, NotificationSender  # TEAM_004: REQ-MISC-001
@@ -70,6 +69,16 @@ except ImportError:
     detect_monitors = None  # type: ignore
     get_monitor_names = None  # type: ignore
 
+
+def __getattr__(name: str):
+    # ComfyClient pulls in requests and websocket; import it on first use
+    # so commands that never talk to ComfyUI start faster
+    if name in ("ComfyClient", "WorkflowManager"):
+        from . import comfy
+        return getattr(comfy, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Config
     "Config",
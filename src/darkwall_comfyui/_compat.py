@@ -0,0 +1,45 @@
+"""
+Compatibility helpers shared across DarkWall ComfyUI modules.
+
+Keeps the Python-version and optional-dependency switches in one place.
+"""
+
+import json
+import sys
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+
+# slots=True needs Python 3.10+; on 3.9 instances keep a regular __dict__.
+SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize to JSON bytes, using orjson when available.
+    
+    Args:
+        data: JSON-serializable data
+        indent: Indent by two spaces instead of writing compact JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """
+    Parse JSON bytes, using orjson when available.
+    
+    Raises:
+        json.JSONDecodeError: On invalid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
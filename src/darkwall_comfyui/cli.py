@@ -32,25 +32,6 @@ from .exceptions import (
     CompositorNotFoundError,
     ScheduleError,
 )
-from .commands import (
-    generate_once,
-    generate_all,
-    retry_last,
-    show_status,
-    init_config,
-    fix_permissions,
-    reset_rotation,
-    validate_config,
-)
-from .commands.prompt import execute as prompt_command
-from .commands.gallery import (
-    gallery_list,
-    gallery_info,
-    gallery_favorite,
-    gallery_delete,
-    gallery_stats,
-    gallery_cleanup,
-)
 
 
 def setup_logging(level: str = "INFO") -> None:
@@ -292,6 +273,7 @@ def main() -> int:
             if config is None:
                 print(f"❌ Cannot validate - config failed to load: {config_error}", file=sys.stderr)
                 return 78
+            from .commands import validate_config
             validate_config(config)
             return 0
         
@@ -302,25 +284,42 @@ def main() -> int:
                 generate_for_monitor(config, args.monitor, dry_run=args.dry_run, 
                                     workflow_override=args.workflow, template_override=args.template)
             else:
+                from .commands import generate_once
                 generate_once(config, dry_run=args.dry_run, workflow_path=args.workflow, template_path=args.template)
         elif command == "generate-all":
+            from .commands import generate_all
             generate_all(config, dry_run=args.dry_run)
         elif command == "retry":
             # TEAM_006: Retry last generation with new seed
+            from .commands import retry_last
             retry_last(config, dry_run=args.dry_run, delete_failed=not args.keep_failed)
         elif command == "status":
+            from .commands import show_status
             show_status(config)
         elif command == "init":
+            from .commands import init_config
             init_config(config)
         elif command == "reset":
+            from .commands import reset_rotation
             reset_rotation(config)
         elif command == "fix-permissions":
+            from .commands import fix_permissions
             fix_permissions(config)
         elif command == "validate":
+            from .commands import validate_config
             validate_config(config)
         elif command == "prompt":
+            from .commands import prompt_command
             prompt_command(args, config)
         elif command == "gallery":
+            from .commands.gallery import (
+                gallery_list,
+                gallery_info,
+                gallery_favorite,
+                gallery_delete,
+                gallery_stats,
+                gallery_cleanup,
+            )
             gallery_cmd = args.gallery_command
             if gallery_cmd == "list":
                 gallery_list(config, monitor_index=args.monitor, favorites_only=args.favorites, 
@@ -7,9 +7,10 @@ Transport logic moved to transport.py, injection logic moved to injection.py.
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Optional, Callable
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple, Union
 
 from ..config import ComfyUIConfig
+from ..exceptions import ComfyClientError
 from ..prompt_generator import PromptResult
 from .transport import ComfyTransport
 from .injection import inject_prompt, inject_prompts, inject_seed
@@ -84,6 +85,23 @@ class ComfyClient:
         Returns:
             GenerationResult with image data
             
+        Raises:
+            ComfyClientError: On any failure
+        """
+        prompt_id = self.submit(workflow, prompt)
+        return self.wait_for_image(prompt_id, on_event=on_event)
+    
+    def submit(self, workflow: dict[str, Any], prompt: str | PromptResult) -> str:
+        """
+        Inject prompt(s) into a copy of the workflow and queue it.
+        
+        Args:
+            workflow: ComfyUI workflow dict (API format)
+            prompt: Text prompt to inject (str) or PromptResult with positive/negative
+            
+        Returns:
+            prompt_id for wait_for_image()
+            
         Raises:
             ComfyClientError: On any failure
         """
@@ -99,10 +117,66 @@ class ComfyClient:
         # Submit workflow
         prompt_id = self._transport.submit(workflow)
         self.logger.info(f"Submitted workflow: {prompt_id}")
+        return prompt_id
+    
+    def wait_for_image(
+        self,
+        prompt_id: str,
+        on_event: Optional[Callable[[Any], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> GenerationResult:
+        """
+        Wait for a submitted prompt to finish and download its image.
         
+        Args:
+            prompt_id: ID returned by submit()
+            on_event: Optional callback for WebSocket events
+            timeout: Seconds to wait, defaults to the configured timeout
+            
+        Returns:
+            GenerationResult with image data
+            
+        Raises:
+            ComfyClientError: On any failure
+        """
         # Wait for completion
-        result = self._transport.wait_for_result(prompt_id, on_event=on_event)
+        result = self._transport.wait_for_result(prompt_id, on_event=on_event, timeout=timeout)
+        return self._download_result(prompt_id, result)
+    
+    def wait_for_images(
+        self,
+        prompt_ids: Sequence[str],
+        on_event: Optional[Callable[[Any], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Tuple[str, Union[GenerationResult, ComfyClientError]]]:
+        """
+        Wait for several submitted prompts, yielding each image as it finishes.
         
+        All prompts are watched over one WebSocket; see
+        ComfyTransport.wait_for_results().
+        
+        Args:
+            prompt_ids: IDs returned by submit(), in submission order
+            on_event: Optional callback for WebSocket events of all prompts
+            timeout: Seconds per prompt, defaults to the configured timeout
+            
+        Yields:
+            (prompt_id, GenerationResult or the ComfyClientError that ended it)
+            
+        Raises:
+            ComfyConnectionError: If the WebSocket cannot be opened
+        """
+        results = self._transport.wait_for_results(prompt_ids, on_event=on_event, timeout=timeout)
+        for prompt_id, outcome in results:
+            if not isinstance(outcome, ComfyClientError):
+                try:
+                    outcome = self._download_result(prompt_id, outcome)
+                except ComfyClientError as e:
+                    outcome = e
+            yield prompt_id, outcome
+    
+    def _download_result(self, prompt_id: str, result: dict[str, Any]) -> GenerationResult:
+        """Download the image named by a transport result."""
         # Download image (use type/subfolder from result for correct path)
         image_data = self._transport.download_image(
             result["filename"],
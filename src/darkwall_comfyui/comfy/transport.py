@@ -10,7 +10,8 @@ import json
 import logging
 import time
 import uuid
-from typing import Any, Optional, Callable
+from contextlib import closing
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple, Union
 from urllib.parse import urljoin, urlparse, urlunparse, urlencode
 
 import requests
@@ -30,6 +31,15 @@ from ..exceptions import (
 logger = logging.getLogger(__name__)
 
 
+def _notify(on_event: Optional[Callable[[Any], None]], event: Any) -> None:
+    """Pass a WebSocket event to the caller's callback, logging its errors."""
+    if on_event is not None:
+        try:
+            on_event(event)
+        except Exception as cb_err:
+            logger.warning(f"on_event callback raised: {cb_err}")
+
+
 class ComfyTransport:
     """
     Low-level HTTP/WebSocket transport for ComfyUI.
@@ -228,6 +238,7 @@ class ComfyTransport:
         self,
         prompt_id: str,
         on_event: Optional[Callable[[Any], None]] = None,
+        timeout: Optional[float] = None,
     ) -> dict[str, Any]:
         """
         Wait for generation completion via WebSocket and read history.
@@ -235,6 +246,7 @@ class ComfyTransport:
         Args:
             prompt_id: The prompt ID to wait for
             on_event: Optional callback for WebSocket events
+            timeout: Seconds to wait, defaults to the configured timeout
             
         Returns:
             Dict with filename, subfolder, type
@@ -244,11 +256,49 @@ class ComfyTransport:
             ComfyTimeoutError: If generation times out
             ComfyGenerationError: If no output found
         """
+        with closing(self.wait_for_results([prompt_id], on_event=on_event, timeout=timeout)) as results:
+            _, outcome = next(results)
+        if isinstance(outcome, ComfyClientError):
+            raise outcome
+        return outcome
+
+    def wait_for_results(
+        self,
+        prompt_ids: Sequence[str],
+        on_event: Optional[Callable[[Any], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Tuple[str, Union[dict[str, Any], ComfyClientError]]]:
+        """
+        Wait for queued prompts over one WebSocket, yielding each as it finishes.
+
+        ComfyUI keeps a single socket per clientId, and a second connection
+        replaces the first, so every prompt submitted by this transport is
+        watched through one connection and its events are matched by
+        prompt_id. The n-th prompt may wait behind the n-1 queued before it,
+        so its limit is n times the timeout.
+
+        Args:
+            prompt_ids: Prompt IDs in the order they were queued
+            on_event: Optional callback for WebSocket events
+            timeout: Seconds per prompt, defaults to the configured timeout
+            
+        Yields:
+            (prompt_id, result) pairs in completion order, where result is the
+            dict with filename, subfolder, type or the ComfyClientError
+            (timeout, execution error, missing output) that ended the prompt
+            
+        Raises:
+            ComfyConnectionError: If the WebSocket cannot be opened
+        """
         start = time.time()
+        if timeout is None:
+            timeout = self.timeout
+        # prompt_id -> seconds it may take, counted from start
+        pending = {prompt_id: timeout * position for position, prompt_id in enumerate(prompt_ids, 1)}
         ws_url = self._build_ws_url()
 
         logger.debug(
-            f"Waiting for generation result via WebSocket: prompt_id={prompt_id} client_id={self.client_id}"
+            f"Waiting for generation results via WebSocket: prompt_ids={list(pending)} client_id={self.client_id}"
         )
 
         try:
@@ -258,13 +308,35 @@ class ComfyTransport:
 
         try:
             ws.settimeout(self.poll_interval)
-            while time.time() - start < self.timeout:
+            # A prompt can finish before the socket is open (e.g. cached by
+            # ComfyUI), in which case no completion event will ever arrive
+            finished = [prompt_id for prompt_id in pending if self.get_history(prompt_id) is not None]
+            while pending:
+                for prompt_id in finished:
+                    del pending[prompt_id]
+                    yield prompt_id, self._collect_result(prompt_id, start)
+                finished = []
+
+                elapsed = time.time() - start
+                for prompt_id in [p for p, limit in pending.items() if elapsed >= limit]:
+                    limit = pending.pop(prompt_id)
+                    yield prompt_id, ComfyTimeoutError(
+                        f"Generation timed out after {elapsed:.1f}s (limit: {limit}s)"
+                    )
+                if not pending:
+                    break
+
                 try:
                     message = ws.recv()
                 except websocket.WebSocketTimeoutException:
                     continue
                 except websocket.WebSocketConnectionClosedException as e:
-                    raise ComfyClientError(f"WebSocket closed while waiting for {prompt_id}: {e}")
+                    for prompt_id in list(pending):
+                        del pending[prompt_id]
+                        yield prompt_id, ComfyClientError(
+                            f"WebSocket closed while waiting for {prompt_id}: {e}"
+                        )
+                    break
 
                 if isinstance(message, bytes):
                     continue
@@ -273,58 +345,58 @@ class ComfyTransport:
                     data = json.loads(message)
                 except json.JSONDecodeError:
                     logger.debug(f"Non-JSON WebSocket message: {message!r}")
-                    if on_event is not None:
-                        try:
-                            on_event(message)
-                        except Exception as cb_err:
-                            logger.warning(f"on_event callback raised: {cb_err}")
+                    _notify(on_event, message)
                     continue
 
-                if on_event is not None:
-                    try:
-                        on_event(data)
-                    except Exception as cb_err:
-                        logger.warning(f"on_event callback raised: {cb_err}")
+                _notify(on_event, data)
 
                 event_type = data.get("type")
+                payload = data.get("data", {})
+                event_prompt_id = payload.get("prompt_id") if isinstance(payload, dict) else None
+                if event_prompt_id not in pending:
+                    continue
+
                 if event_type == "executing":
-                    payload = data.get("data", {})
-                    event_prompt_id = payload.get("prompt_id")
                     node = payload.get("node")
-
-                    if event_prompt_id != prompt_id:
-                        continue
-
                     if node is None:
                         elapsed = time.time() - start
                         logger.debug(
-                            f"WebSocket reports execution complete for {prompt_id} in {elapsed:.1f}s"
+                            f"WebSocket reports execution complete for {event_prompt_id} in {elapsed:.1f}s"
                         )
-                        break
+                        finished.append(event_prompt_id)
                     else:
-                        logger.debug(f"WebSocket executing node {node} for {prompt_id}")
+                        logger.debug(f"WebSocket executing node {node} for {event_prompt_id}")
                 elif event_type == "execution_error":
-                    payload = data.get("data", {})
-                    event_prompt_id = payload.get("prompt_id")
-                    if event_prompt_id == prompt_id:
-                        error_msg = payload.get("exception_message", "Unknown error")
-                        node_id = payload.get("node_id", "unknown")
-                        node_type = payload.get("node_type", "unknown")
-                        logger.error(f"ComfyUI execution error in node {node_id} ({node_type}): {error_msg}")
-                        raise ComfyGenerationError(f"ComfyUI error in {node_type}: {error_msg}")
+                    error_msg = payload.get("exception_message", "Unknown error")
+                    node_id = payload.get("node_id", "unknown")
+                    node_type = payload.get("node_type", "unknown")
+                    logger.error(f"ComfyUI execution error in node {node_id} ({node_type}): {error_msg}")
+                    del pending[event_prompt_id]
+                    yield event_prompt_id, ComfyGenerationError(f"ComfyUI error in {node_type}: {error_msg}")
                 elif event_type is not None:
-                    logger.debug(f"WebSocket event {event_type} for {prompt_id}: {data}")
-            else:
-                elapsed = time.time() - start
-                raise ComfyTimeoutError(
-                    f"Generation timed out after {elapsed:.1f}s (limit: {self.timeout}s)"
-                )
+                    logger.debug(f"WebSocket event {event_type} for {event_prompt_id}: {data}")
         finally:
             try:
                 ws.close()
             except Exception:
                 pass
 
+    def _collect_result(
+        self, prompt_id: str, start: float
+    ) -> Union[dict[str, Any], ComfyClientError]:
+        """Read a finished prompt's output, returning rather than raising errors."""
+        try:
+            return self._read_result(prompt_id, start)
+        except ComfyClientError as e:
+            return e
+
+    def _read_result(self, prompt_id: str, start: float) -> dict[str, Any]:
+        """
+        Read the output image of a finished prompt from history.
+
+        Raises:
+            ComfyGenerationError: If no output found
+        """
         # Read history with grace period
         history = None
         history_start = time.time()
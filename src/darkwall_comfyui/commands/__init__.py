@@ -1,20 +1,35 @@
-"""CLI commands module."""
+"""CLI commands module.
 
-from .generate import generate_once, generate_all, generate_next, generate_for_monitor, retry_last
-from .status import show_status
-from .init import init_config, fix_permissions, reset_rotation, validate_config
-from .prompt import execute as prompt_command
+Commands are imported on first access: the generation and status
+commands pull in requests/websocket (via ComfyClient) and tqdm, which
+init, reset, prompt and gallery never need.
+"""
 
-__all__ = [
-    "generate_once",
-    "generate_next",
-    "generate_for_monitor",
-    "generate_all",
-    "retry_last",
-    "show_status",
-    "init_config",
-    "fix_permissions",
-    "reset_rotation",
-    "validate_config",
-    "prompt_command",
-]
+from importlib import import_module
+
+# Exported name -> (submodule, attribute)
+_COMMANDS = {
+    "generate_once": ("generate", "generate_once"),
+    "generate_next": ("generate", "generate_next"),
+    "generate_for_monitor": ("generate", "generate_for_monitor"),
+    "generate_all": ("generate", "generate_all"),
+    "retry_last": ("generate", "retry_last"),
+    "show_status": ("status", "show_status"),
+    "init_config": ("init", "init_config"),
+    "fix_permissions": ("init", "fix_permissions"),
+    "reset_rotation": ("init", "reset_rotation"),
+    "validate_config": ("init", "validate_config"),
+    "prompt_command": ("prompt", "execute"),
+}
+
+__all__ = list(_COMMANDS)
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attr = _COMMANDS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value
+    return value
@@ -10,21 +10,23 @@ TEAM_003: Consolidated from generate_v2.py - single canonical implementation.
 
 import logging
 import random
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from tqdm import tqdm
 
 from ..config import (
     Config,
+    HistoryConfig,
     NamedStateManager,
     PerMonitorConfig,
     ThemeConfig,
 )
 # TEAM_006: ConfigV2 deleted - merged into Config
-from ..comfy import ComfyClient, WorkflowManager
-from ..prompt_generator import PromptGenerator
+from ..comfy import ComfyClient, GenerationResult, WorkflowManager
+from ..prompt_generator import PromptGenerator, PromptResult
 from ..wallpaper import WallpaperTarget
 from ..history import WallpaperHistory
 from ..schedule import ThemeScheduler
@@ -35,6 +37,85 @@ logger = logging.getLogger(__name__)
 _progress_bars = {}
 
 
+@dataclass
+class _GenerationContext:
+    """
+    Collaborators shared by every monitor of one generate_all() run.
+    
+    Built once so the ComfyUI session, parsed workflows, prompt generators,
+    wallpaper target and history index are reused across monitors, and
+    ComfyUI is only probed until it first answers.
+    """
+    client: ComfyClient
+    target: WallpaperTarget
+    workflow_mgr: WorkflowManager
+    history_config: Optional[HistoryConfig] = None
+    workflows: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    prompt_gens: Dict[str, PromptGenerator] = field(default_factory=dict)
+    healthy: bool = False
+    _history: Optional[WallpaperHistory] = field(default=None, init=False, repr=False)
+    
+    @classmethod
+    def from_config(cls, config: Config) -> '_GenerationContext':
+        """Create the shared collaborators for a config."""
+        return cls(
+            client=ComfyClient(config.comfyui),
+            target=WallpaperTarget(config.monitors),
+            workflow_mgr=WorkflowManager(config.comfyui),
+            history_config=config.history if hasattr(config, 'history') else None,
+        )
+    
+    @property
+    def history(self) -> WallpaperHistory:
+        """
+        Get the history index, opened when the first image is saved.
+        
+        As before the context existed, a broken history directory only
+        fails a monitor at save time instead of aborting the whole run
+        before ComfyUI is contacted; the next save tries again.
+        """
+        if self._history is None:
+            self._history = WallpaperHistory(self.history_config)
+        return self._history
+    
+    def prompt_generator(self, config: Config, theme_name: str) -> PromptGenerator:
+        """Get the prompt generator for a theme, creating it on first use."""
+        prompt_gen = self.prompt_gens.get(theme_name)
+        if prompt_gen is None:
+            prompt_gen = self.prompt_gens[theme_name] = PromptGenerator.from_config(config, theme_name)
+        return prompt_gen
+    
+    def load_workflow(self, workflow_path: str) -> Dict[str, Any]:
+        """Load a workflow once per path; injection works on copies."""
+        workflow = self.workflows.get(workflow_path)
+        if workflow is None:
+            workflow = self.workflows[workflow_path] = self.workflow_mgr.load(
+                Path(workflow_path), Config.get_config_dir()
+            )
+        return workflow
+    
+    def ensure_healthy(self, config: Config) -> None:
+        """Raise GenerationError unless ComfyUI has answered a health check."""
+        if not self.healthy:
+            if not self.client.health_check():
+                raise GenerationError(f"ComfyUI not reachable at {config.comfyui.base_url}")
+            self.healthy = True
+
+
+@dataclass
+class _GenerationJob:
+    """Everything decided for one monitor before its workflow is queued."""
+    monitor_name: str
+    theme_name: str
+    workflow_id: str
+    workflow_path: str
+    template_path: str
+    output_path: Path
+    prompts: PromptResult
+    monitor_seed_offset: int
+    base_seed: int
+
+
 def _make_ws_event_handler(workflow: dict) -> Callable[[object], None]:
     """
     Create a WebSocket event handler with workflow context for node name lookup.
@@ -51,7 +132,7 @@ def _make_ws_event_handler(workflow: dict) -> Callable[[object], None]:
             if isinstance(event, dict):
                 event_type = event.get("type")
                 data = event.get("data", {})
-
+                
                 if event_type == "executing" and isinstance(data, dict):
                     node = data.get("node")
 
@@ -114,6 +195,25 @@ def _make_ws_event_handler(workflow: dict) -> Callable[[object], None]:
     return handler
 
 
+def _dispatch_ws_events(handlers: Dict[str, Callable[[object], None]]) -> Callable[[object], None]:
+    """
+    Route WebSocket events of several queued prompts to each prompt's handler.
+    
+    Args:
+        handlers: Event handler per prompt_id, from _make_ws_event_handler()
+    """
+    def dispatch(event: object) -> None:
+        """Forward an event to the handler of the prompt it belongs to."""
+        if isinstance(event, dict):
+            data = event.get("data")
+            if isinstance(data, dict):
+                handler = handlers.get(data.get("prompt_id"))
+                if handler is not None:
+                    handler(event)
+    
+    return dispatch
+
+
 def _get_available_prompts(config: Config, theme_name: Optional[str] = None) -> List[str]:
     """
     Get list of available prompt templates from the theme.
@@ -204,6 +304,36 @@ def generate_for_monitor(
         workflow_override: Optional workflow path override
         template_override: Optional template path override
     """
+    job = _plan_generation(config, monitor_name, dry_run, workflow_override, template_override)
+    if job is None:
+        return
+    
+    context = _GenerationContext.from_config(config)
+    
+    # Load workflow
+    workflow = context.load_workflow(job.workflow_path)
+    
+    # Generate image
+    context.ensure_healthy(config)
+    result = context.client.generate(workflow, job.prompts, on_event=_make_ws_event_handler(workflow))
+    
+    _finish_generation(config, job, result, context)
+
+
+def _plan_generation(
+    config: Config,
+    monitor_name: str,
+    dry_run: bool = False,
+    workflow_override: Optional[str] = None,
+    template_override: Optional[str] = None,
+    context: Optional[_GenerationContext] = None,
+) -> Optional[_GenerationJob]:
+    """
+    Choose theme, workflow and template for a monitor and generate its prompts.
+    
+    Returns:
+        The planned job, or None for a dry run (the plan is printed instead)
+    """
     monitor_config = config.get_monitor_config(monitor_name)
     if not monitor_config:
         raise ConfigError(f"Monitor '{monitor_name}' not configured")
@@ -264,7 +394,10 @@ def generate_for_monitor(
         workflow_id = monitor_config.workflow
     
     # Create theme-aware PromptGenerator
-    prompt_gen = PromptGenerator.from_config(config, current_theme_name)
+    if context is not None:
+        prompt_gen = context.prompt_generator(config, current_theme_name)
+    else:
+        prompt_gen = PromptGenerator.from_config(config, current_theme_name)
     logger.info(f"Using prompt generator for theme '{current_theme_name}'")
     monitor_seed_offset = hash(monitor_name) % 10000
     base_seed = prompt_gen.get_time_slot_seed(monitor_index=monitor_seed_offset)
@@ -301,7 +434,7 @@ def generate_for_monitor(
             print(f"  Prompt error: {e}")
         
         print("DRY RUN: No actual changes made")
-        return
+        return None
     
     logger.info(f"Generating wallpaper for monitor {monitor_name}")
     logger.info(f"Output: {output_path}")
@@ -319,31 +452,43 @@ def generate_for_monitor(
         if text:
             logger.info(f"[{section}]: {text[:80]}...")
     
-    # Load workflow
-    workflow_mgr = WorkflowManager(config.comfyui)
-    workflow = workflow_mgr.load(Path(workflow_path), Config.get_config_dir())
-    
-    # Generate image
-    client = ComfyClient(config.comfyui)
-    if not client.health_check():
-        raise GenerationError(f"ComfyUI not reachable at {config.comfyui.base_url}")
-    
-    result = client.generate(workflow, prompts, on_event=_make_ws_event_handler(workflow))
+    return _GenerationJob(
+        monitor_name=monitor_name,
+        theme_name=current_theme_name,
+        workflow_id=workflow_id,
+        workflow_path=workflow_path,
+        template_path=template_path,
+        output_path=output_path,
+        prompts=prompts,
+        monitor_seed_offset=monitor_seed_offset,
+        base_seed=base_seed,
+    )
+
+
+def _finish_generation(
+    config: Config,
+    job: _GenerationJob,
+    result: GenerationResult,
+    context: _GenerationContext,
+) -> None:
+    """Save a generated image, record it in history and set it as wallpaper."""
+    monitor_name = job.monitor_name
+    prompts = job.prompts
     logger.info(f"Generated: {result.filename}")
     
     # TEAM_006: Use MonitorsConfig directly (no legacy wrapper)
-    target = WallpaperTarget(config.monitors)
-    saved_path = target.save_wallpaper(result.image_data, output_path)
+    target = context.target
+    saved_path = target.save_wallpaper(result.image_data, job.output_path)
     
     # Save to history
-    history = WallpaperHistory(config.history if hasattr(config, 'history') else None)
+    history = context.history
     history_entry = history.save_wallpaper(
         image_data=result.image_data,
         generation_result=result,
         prompt_result=prompts,
-        monitor_index=monitor_seed_offset,
-        template=template_path,
-        workflow=workflow_path,
+        monitor_index=job.monitor_seed_offset,
+        template=job.template_path,
+        workflow=job.workflow_path,
         seed=getattr(prompts, "seed", None),
     )
     logger.info(f"Saved to history: {history_entry.filename}")
@@ -359,12 +504,12 @@ def generate_for_monitor(
     state_mgr = NamedStateManager(active_monitors)
     state_mgr.save_last_generation(
         monitor_name=monitor_name,
-        theme_name=current_theme_name,
-        workflow_id=workflow_id,
-        template=template_path,
+        theme_name=job.theme_name,
+        workflow_id=job.workflow_id,
+        template=job.template_path,
         prompts=prompts.prompts,
         negatives=prompts.negatives,
-        seed=base_seed,
+        seed=job.base_seed,
         output_path=str(saved_path),
         history_path=str(history_entry.path) if history_entry else None,
     )
@@ -417,6 +562,16 @@ def generate_next(
                         workflow_override=workflow_path, template_override=template_path)
 
 
+def _monitor_error(monitor_name: str, error: Exception) -> str:
+    """Log a per-monitor failure and format it for generate_all's summary."""
+    if isinstance(error, (ConfigError, GenerationError, WorkflowError, PromptError, CommandError)):
+        error_msg = f"Monitor {monitor_name}: {error}"
+    else:
+        error_msg = f"Monitor {monitor_name}: Unexpected error: {error}"
+    logger.error(error_msg)
+    return error_msg
+
+
 def generate_all(config: Config, dry_run: bool = False) -> None:
     """
     Generate wallpapers for all active monitors.
@@ -439,22 +594,48 @@ def generate_all(config: Config, dry_run: bool = False) -> None:
     
     success_count = 0
     errors = []
+    # One client, target, history and workflow cache for all monitors
+    context = _GenerationContext.from_config(config)
     
+    # Queue every monitor's workflow up front so ComfyUI runs them back to
+    # back instead of idling while each image is downloaded and saved
+    queued = []
     for monitor_name in active_monitors:
         logger.info(f"--- Monitor: {monitor_name} ---")
         
         try:
-            generate_for_monitor(config, monitor_name)
-            success_count += 1
-            logger.info(f"Monitor {monitor_name}: OK")
-        except (ConfigError, GenerationError, WorkflowError, PromptError, CommandError) as e:
-            error_msg = f"Monitor {monitor_name}: {e}"
-            logger.error(error_msg)
-            errors.append(error_msg)
+            job = _plan_generation(config, monitor_name, context=context)
+            workflow = context.load_workflow(job.workflow_path)
+            context.ensure_healthy(config)
+            prompt_id = context.client.submit(workflow, job.prompts)
+            queued.append((job, workflow, prompt_id))
+        except Exception as e:
+            errors.append(_monitor_error(monitor_name, e))
+    
+    # Wait for every queued prompt over the client's single WebSocket
+    # (ComfyUI keeps one socket per client ID); saving, history and
+    # wallpaper setting happen as each result arrives. The n-th queued
+    # prompt may wait behind n-1 others, so its timeout grows with position.
+    if queued:
+        jobs = {prompt_id: job for job, _, prompt_id in queued}
+        on_event = _dispatch_ws_events({
+            prompt_id: _make_ws_event_handler(workflow) for _, workflow, prompt_id in queued
+        })
+        try:
+            for prompt_id, outcome in context.client.wait_for_images(list(jobs), on_event=on_event):
+                job = jobs.pop(prompt_id)
+                try:
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    _finish_generation(config, job, outcome, context)
+                    success_count += 1
+                    logger.info(f"Monitor {job.monitor_name}: OK")
+                except Exception as e:
+                    errors.append(_monitor_error(job.monitor_name, e))
         except Exception as e:
-            error_msg = f"Monitor {monitor_name}: Unexpected error: {e}"
-            logger.error(error_msg)
-            errors.append(error_msg)
+            # The WebSocket could not be opened; every remaining monitor failed
+            for job in jobs.values():
+                errors.append(_monitor_error(job.monitor_name, e))
     
     logger.info(f"Completed: {success_count}/{len(active_monitors)} monitors")
     
@@ -2,10 +2,11 @@
 
 import logging
 import os
+import stat
 from pathlib import Path
+from typing import Iterator
 
 from ..config import Config, NamedStateManager
-from ..comfy import ComfyClient
 
 
 def init_config(config: Config) -> None:
@@ -13,7 +14,8 @@ def init_config(config: Config) -> None:
     logger = logging.getLogger(__name__)
     
     try:
-        Config.initialize_config()
+        # Explicit init re-checks the config even if already marked initialized
+        Config.initialize_config(force=True)
         print(f"Configuration initialized at {Config.get_config_dir()}")
         
         # Show what was created
@@ -28,6 +30,25 @@ def init_config(config: Config) -> None:
         raise
 
 
+def _walk_tree(path: str) -> Iterator[os.DirEntry]:
+    """Yield every entry below path, without descending into symlinked dirs."""
+    with os.scandir(path) as it:
+        entries = list(it)
+    for entry in entries:
+        yield entry
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_tree(entry.path)
+
+
+def _is_writable(entry: os.DirEntry) -> bool:
+    """Check whether we can write to a file found by _walk_tree."""
+    st = entry.stat()
+    # Our own file with the owner write bit set needs no os.access() call
+    if st.st_uid == os.getuid() and st.st_mode & stat.S_IWUSR:
+        return True
+    return os.access(entry.path, os.W_OK)
+
+
 def fix_permissions(config: Config) -> None:
     """Fix read-only permissions on config files."""
     config_dir = Config.get_config_dir()
@@ -37,11 +58,16 @@ def fix_permissions(config: Config) -> None:
     fixed = 0
     errors = 0
     
-    for path in config_dir.rglob('*'):
-        if path.is_file() and not os.access(path, os.W_OK):
+    # scandir entries carry the file type, so only files we may have to
+    # fix are stat()ed and no Path objects are built for the rest
+    prefix_len = len(str(config_dir)) + 1
+    for entry in _walk_tree(str(config_dir)):
+        rel = entry.path[prefix_len:]
+        if entry.is_file() and not _is_writable(entry):
+            path = Path(entry.path)
             try:
                 os.chmod(path, 0o644)
-                print(f"  Fixed: {path.relative_to(config_dir)}")
+                print(f"  Fixed: {rel}")
                 fixed += 1
             except PermissionError:
                 try:
@@ -50,14 +76,14 @@ def fix_permissions(config: Config) -> None:
                     path.unlink()
                     path.write_bytes(content)
                     os.chmod(path, 0o644)
-                    print(f"  Replaced: {path.relative_to(config_dir)}")
+                    print(f"  Replaced: {rel}")
                     fixed += 1
                 except Exception as e:
-                    print(f"  ERROR: {path.relative_to(config_dir)}: {e}")
+                    print(f"  ERROR: {rel}: {e}")
                     errors += 1
-        elif path.is_dir():
+        elif entry.is_dir():
             try:
-                os.chmod(path, 0o755)
+                os.chmod(entry.path, 0o755)
             except Exception:
                 pass
     
@@ -86,6 +112,7 @@ def validate_config(config: Config) -> None:
     # Validate ComfyUI connectivity
     print("\nChecking ComfyUI connectivity...")
     try:
+        from ..comfy import ComfyClient
         client = ComfyClient(config.comfyui)
         if client.health_check():
             print("  ✓ ComfyUI is reachable")
@@ -114,9 +141,10 @@ def validate_config(config: Config) -> None:
     # Validate themes
     print("\nChecking themes...")
     if config.themes:
+        config_dir = Config.get_config_dir()
         for theme_name, theme_config in config.themes.items():
-            atoms_path = theme_config.get_atoms_path(Config.get_config_dir())
-            prompts_path = theme_config.get_prompts_path(Config.get_config_dir())
+            atoms_path = theme_config.get_atoms_path(config_dir)
+            prompts_path = theme_config.get_prompts_path(config_dir)
             
             if atoms_path.exists():
                 atom_count = len(list(atoms_path.glob('*.txt')))
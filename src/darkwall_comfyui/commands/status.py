@@ -46,11 +46,18 @@ def _get_monitors_status(config: Config) -> Dict[str, Any]:
         monitor = config.monitors.get_monitor(name)
         if monitor:
             output_path = monitor.get_output_path()
+            # One stat() answers both "exists" and "size"
+            try:
+                size_kb = output_path.stat().st_size / 1024
+                exists = True
+            except OSError:
+                size_kb = 0
+                exists = False
             monitors[name] = {
                 "workflow": monitor.workflow,
                 "output": str(output_path),
-                "exists": output_path.exists(),
-                "size_kb": output_path.stat().st_size / 1024 if output_path.exists() else 0,
+                "exists": exists,
+                "size_kb": size_kb,
                 "active": name in config.active_monitors,
             }
     
@@ -105,10 +112,11 @@ def show_status(config: Config, json_output: bool = False) -> None:
     
     print("DarkWall ComfyUI Status")
     print("=" * 40)
+    config_dir = Config.get_config_dir()
     
     # Config info
     print(f"\nConfiguration")
-    print(f"  Config dir: {Config.get_config_dir()}")
+    print(f"  Config dir: {config_dir}")
     print(f"  ComfyUI:    {config.comfyui.base_url}")
     print(f"  Monitors:   {len(config.active_monitors)} active")
     print(f"  Theme:      {config.prompt.theme}")
@@ -190,7 +198,7 @@ def show_status(config: Config, json_output: bool = False) -> None:
     print(f"\nThemes")
     if config.themes:
         for theme_name, theme_config in config.themes.items():
-            atoms_path = theme_config.get_atoms_path(Config.get_config_dir())
+            atoms_path = theme_config.get_atoms_path(config_dir)
             if atoms_path.exists():
                 atom_count = len(list(atoms_path.glob('*.txt')))
                 print(f"  {theme_name:12} {atom_count} atom files")
@@ -5,12 +5,29 @@ TEAM_007: Split from monolithic config.py for better organization.
 """
 
 import os
+import random
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, FrozenSet, Optional, List, Sequence, Tuple
 from dataclasses import dataclass, field
 
+from .._compat import SLOTS
 
-@dataclass
+
+@lru_cache(maxsize=None)
+def _expand_user_for(path: str, home: Optional[str]) -> Path:
+    """Expand ~ in a configured path, cached per path string and HOME."""
+    return Path(path).expanduser()
+
+
+def _expand_user(path: str) -> Path:
+    """Expand ~ in a configured path, following changes to HOME."""
+    return _expand_user_for(path, os.environ.get("HOME"))
+
+
+@dataclass(frozen=True, **SLOTS)
 class CleanupPolicy:
     """Cleanup policy for history management."""
     max_count: Optional[int] = None  # Keep max N wallpapers
@@ -19,7 +36,7 @@ class CleanupPolicy:
     max_size_mb: Optional[int] = None  # Keep history under X MB
 
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class WeightedWorkflow:
     """A workflow prefix with a selection weight."""
     prefix: str
@@ -35,7 +52,45 @@ class WeightedWorkflow:
         raise ValueError(f"Invalid workflow config: {data}")
 
 
-@dataclass
+# Workflow lists at least this long are sampled with an alias table
+_ALIAS_THRESHOLD = 16
+
+
+class _AliasTable:
+    """
+    Vose alias table for O(1) weighted draws from a fixed set of weights.
+    
+    Weights must be non-negative with a positive total.
+    """
+    __slots__ = ('prob', 'alias')
+    
+    def __init__(self, weights: Sequence[float]) -> None:
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to rounding error and keep prob = 1.0
+        
+        self.prob: Tuple[float, ...] = tuple(prob)
+        self.alias: Tuple[int, ...] = tuple(alias)
+    
+    def sample(self) -> int:
+        """Draw an index with probability proportional to its weight."""
+        i = int(random.random() * len(self.prob))
+        return i if random.random() < self.prob[i] else self.alias[i]
+
+
+@dataclass(frozen=True, **SLOTS)
 class ThemeConfig:
     """
     Configuration for a content theme.
@@ -54,6 +109,22 @@ class ThemeConfig:
     default_template: str = "default.prompt"
     workflow_prefix: Optional[str] = None  # TEAM_006: Single prefix (legacy)
     workflows: Optional[List[WeightedWorkflow]] = None  # TEAM_006: Weighted list of prefixes
+    # Derived from workflows in __post_init__ for select_workflow_prefix()
+    _prefixes: Tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    _cum_weights: Tuple[float, ...] = field(default=(), init=False, repr=False, compare=False)
+    _alias_table: Optional[_AliasTable] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        if self.workflows:
+            object.__setattr__(self, '_prefixes', tuple(w.prefix for w in self.workflows))
+            object.__setattr__(
+                self, '_cum_weights', tuple(accumulate(w.weight for w in self.workflows))
+            )
+            if len(self.workflows) >= _ALIAS_THRESHOLD and self._cum_weights[-1] > 0 \
+                    and all(w.weight >= 0 for w in self.workflows):
+                object.__setattr__(
+                    self, '_alias_table', _AliasTable([w.weight for w in self.workflows])
+                )
     
     def get_atoms_path(self, config_dir: Path) -> Path:
         """Get absolute path to atoms directory for this theme."""
@@ -77,19 +148,12 @@ class ThemeConfig:
         Returns:
             Selected workflow prefix
         """
-        import random
-        
         # If workflows list is configured, use weighted selection
-        if self.workflows:
-            total_weight = sum(w.weight for w in self.workflows)
-            if total_weight > 0:
-                r = random.random() * total_weight
-                cumulative = 0.0
-                for w in self.workflows:
-                    cumulative += w.weight
-                    if r <= cumulative:
-                        return w.prefix
-                return self.workflows[-1].prefix
+        if self._alias_table is not None:
+            return self._prefixes[self._alias_table.sample()]
+        if self._cum_weights and self._cum_weights[-1] > 0:
+            r = random.random() * self._cum_weights[-1]
+            return self._prefixes[bisect_right(self._cum_weights, r, 0, len(self._cum_weights) - 1)]
         
         # Fallback to single workflow_prefix or theme name
         return self.workflow_prefix or self.name
@@ -113,13 +177,13 @@ class ThemeConfig:
     def get_workflow_weights_display(self) -> str:
         """Get a display string showing workflow weights."""
         if self.workflows:
-            parts = [f"{w.prefix}: {w.weight/(sum(ww.weight for ww in self.workflows))*100:.0f}%" 
-                     for w in self.workflows]
+            total = self._cum_weights[-1] or 1.0
+            parts = [f"{w.prefix}: {w.weight/total*100:.0f}%" for w in self.workflows]
             return ", ".join(parts)
         return self.workflow_prefix or self.name
 
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class WorkflowConfig:
     """
     Configuration for a workflow with optional prompt filtering.
@@ -131,6 +195,13 @@ class WorkflowConfig:
     """
     name: str  # Workflow ID (filename without .json)
     prompts: Optional[List[str]] = None  # Optional: restrict to these prompts only
+    # Allowed prompts as a set for filter_prompts(); None means no filtering
+    _allowed: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        # TEAM_006: ["*"] means all prompts, same as no filter
+        if self.prompts is not None and "*" not in self.prompts:
+            object.__setattr__(self, '_allowed', frozenset(self.prompts))
     
     def get_workflow_path(self, config_dir: Path) -> Path:
         """
@@ -141,7 +212,7 @@ class WorkflowConfig:
         workflow_id = self.name
         if not workflow_id.endswith(".json"):
             workflow_id = f"{workflow_id}.json"
-        return config_dir / "workflows" / workflow_id
+        return config_dir.joinpath("workflows", workflow_id)
     
     def filter_prompts(self, available_prompts: List[str]) -> List[str]:
         """
@@ -156,15 +227,12 @@ class WorkflowConfig:
         Returns:
             Filtered list of prompts (all if no filter configured)
         """
-        if self.prompts is None:
-            return available_prompts
-        # TEAM_006: ["*"] means all prompts
-        if "*" in self.prompts:
+        if self._allowed is None:
             return available_prompts
-        return [p for p in available_prompts if p in self.prompts]
+        return [p for p in available_prompts if p in self._allowed]
 
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class PerMonitorConfig:
     """
     Configuration for a single monitor (new format).
@@ -178,12 +246,16 @@ class PerMonitorConfig:
     templates: Optional[List[str]] = None  # Allowed templates for this monitor
     resolution: Optional[str] = None  # TEAM_006: e.g., "2327x1309", "1920x1080" - used with theme.workflow_prefix
     command: Optional[str] = None  # Per-monitor wallpaper setter override
+    # Explicit workflow's filename, resolved once in __post_init__
+    _workflow_file: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        workflow_file = self.workflow if self.workflow.endswith(".json") else f"{self.workflow}.json"
+        object.__setattr__(self, '_workflow_file', workflow_file)
     
     def get_output_path(self) -> Path:
         """Get output path for this monitor."""
-        if self.output:
-            return Path(self.output).expanduser()
-        return Path(f"~/Pictures/wallpapers/{self.name}.png").expanduser()
+        return _expand_user(self.output or f"~/Pictures/wallpapers/{self.name}.png")
     
     def get_workflow_path(self, config_dir: Path, theme: Optional['ThemeConfig'] = None) -> Path:
         """
@@ -194,20 +266,19 @@ class PerMonitorConfig:
         """
         # TEAM_006: Theme-based workflow selection
         if theme and theme.workflow_prefix and self.resolution:
-            workflow_id = theme.get_workflow_for_resolution(self.resolution)
+            # Theme workflows are drawn fresh each call, so only this
+            # branch builds the filename at call time.
+            workflow_file = f"{theme.get_workflow_for_resolution(self.resolution)}.json"
         else:
-            workflow_id = self.workflow
-            
-        if not workflow_id.endswith(".json"):
-            workflow_id = f"{workflow_id}.json"
-        return config_dir / "workflows" / workflow_id
+            workflow_file = self._workflow_file
+        return config_dir.joinpath("workflows", workflow_file)
     
     def get_resolution(self) -> Optional[str]:
         """Get monitor resolution string."""
         return self.resolution
 
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class MonitorsConfig:
     """
     New-style monitors configuration using compositor names.
@@ -245,27 +316,24 @@ class MonitorsConfig:
             "command": "swaybg"
         }
         """
-        monitors = {}
-        command = "swaybg"
-        
-        for key, value in config_dict.items():
-            if key == "command":
-                command = value
-            elif isinstance(value, dict):
-                # This is a monitor config
-                monitors[key] = PerMonitorConfig(
-                    name=key,
-                    workflow=value.get("workflow", "default"),
-                    output=value.get("output"),
-                    templates=value.get("templates"),
-                    resolution=value.get("resolution"),  # TEAM_006: For theme-based workflow
-                    command=value.get("command"),  # Per-monitor wallpaper setter
-                )
+        # Every table except the scalar "command" key is a monitor config
+        monitors = {
+            key: PerMonitorConfig(
+                name=key,
+                workflow=value.get("workflow", "default"),
+                output=value.get("output"),
+                templates=value.get("templates"),
+                resolution=value.get("resolution"),  # TEAM_006: For theme-based workflow
+                command=value.get("command"),  # Per-monitor wallpaper setter
+            )
+            for key, value in config_dict.items()
+            if isinstance(value, dict) and key != "command"
+        }
         
-        return cls(monitors=monitors, command=command)
+        return cls(monitors=monitors, command=config_dict.get("command", "swaybg"))
 
 
-@dataclass
+@dataclass(**SLOTS)
 class ComfyUIConfig:
     """ComfyUI connection settings."""
     base_url: str = "https://comfyui.home.arpa"
@@ -275,7 +343,7 @@ class ComfyUIConfig:
     headers: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class PromptConfig:
     """Prompt generation settings."""
     time_slot_minutes: int = 30
@@ -285,14 +353,14 @@ class PromptConfig:
     variations_per_monitor: int = 1
 
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class LoggingConfig:
     """Logging configuration."""
     level: str = "INFO"
     verbose: bool = False
 
 
-@dataclass
+@dataclass(**SLOTS)
 class HistoryConfig:
     """Wallpaper history configuration."""
     enabled: bool = True
@@ -302,4 +370,4 @@ class HistoryConfig:
     
     def get_history_dir(self) -> Path:
         """Get absolute history directory path."""
-        return Path(self.history_dir).expanduser()
+        return _expand_user(self.history_dir)
@@ -4,18 +4,32 @@ Main Config class for DarkWall ComfyUI.
 TEAM_007: Split from monolithic config.py for better organization.
 """
 
+import copy
 import os
 import logging
+import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
-from dataclasses import dataclass, field
+from typing import Dict, Any, FrozenSet, Optional, List, Set, Tuple
+from dataclasses import dataclass, field, fields
 
 try:
-    import tomli
+    import tomllib as tomli  # Python 3.11+ stdlib
 except ImportError:
-    raise ImportError("Required package 'tomli' not found. Install with: pip install tomli")
+    try:
+        import tomli
+    except ImportError:
+        raise ImportError("Required package 'tomli' not found. Install with: pip install tomli")
 
 from ..exceptions import ConfigError, ConfigValidationError
+from ..schedule import ScheduleConfig, WeightedTheme
+from ..notifications import NotificationConfig
+
+# Monitor detection module (may not be available in cached builds)
+try:
+    from ..monitor_detection import detect_monitors as _detect_monitors
+except ImportError:
+    _detect_monitors = None  # type: ignore
 
 from .dataclasses import (
     CleanupPolicy,
@@ -30,13 +44,77 @@ from .dataclasses import (
     HistoryConfig,
 )
 from .validation import (
-    URL_PATTERN,
+    is_valid_url,
     validate_toml_structure,
 )
 
-if TYPE_CHECKING:
-    from ..schedule import ScheduleConfig
-    from ..notifications import NotificationConfig
+
+# Marker file written into the config directory once initialize_config()
+# has copied the default templates without errors.
+INIT_MARKER = ".initialized"
+
+# Config directories already initialized by this process. Lets repeated
+# initialize_config() calls return after the config.toml stat alone.
+_initialized_config_dirs: Set[Path] = set()
+
+logger = logging.getLogger(__name__)
+
+# Defaults for optional keys in a [themes.<name>] section
+_THEME_DEFAULTS: Dict[str, Any] = {
+    'atoms_dir': 'atoms',
+    'prompts_dir': 'prompts',
+    'default_template': 'default.prompt',
+    'workflow_prefix': None,
+}
+
+# Parsed and validated TOML per config file, keyed on (st_mtime_ns, st_size)
+# so an unchanged file costs a single stat() on repeated loads.
+_toml_cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+@lru_cache(maxsize=None)
+def _config_dir_for(xdg_config: Optional[str], home: Optional[str]) -> Path:
+    """
+    Resolve the config directory for the given environment.
+    
+    Cached on the relevant environment values, so repeated lookups build no
+    Path objects while a changed XDG_CONFIG_HOME/HOME still takes effect.
+    """
+    if xdg_config:
+        return Path(xdg_config) / "darkwall-comfyui"
+    return Path.home() / ".config" / "darkwall-comfyui"
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> FrozenSet[str]:
+    """Get the init field names of a config dataclass, computed once per class."""
+    return frozenset(f.name for f in fields(cls) if f.init)
+
+
+def _load_toml_cached(config_file: Path) -> Dict[str, Any]:
+    """
+    Parse and validate a TOML config file, reusing the previous result if unchanged.
+    
+    Only dicts that passed validate_toml_structure are cached, so an
+    unchanged file skips validation as well as parsing.
+    Returns a deep copy so callers can never mutate the cached dict.
+    
+    Raises:
+        OSError: If the file cannot be read
+        tomli.TOMLDecodeError: If the file is not valid TOML
+        ConfigError: If the file has an invalid structure
+    """
+    st = config_file.stat()
+    cached = _toml_cache.get(config_file)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return copy.deepcopy(cached[2])
+    
+    # Config files are small: one read and an in-memory parse beats
+    # feeding the parser through a buffered file object.
+    config_dict = tomli.loads(config_file.read_text(encoding='utf-8'))
+    validate_toml_structure(config_dict, config_file)
+    _toml_cache[config_file] = (st.st_mtime_ns, st.st_size, config_dict)
+    return copy.deepcopy(config_dict)
 
 
 @dataclass
@@ -68,7 +146,7 @@ class Config:
     def __post_init__(self) -> None:
         """Validate and post-process configuration."""
         # Validate ComfyUI settings
-        if not URL_PATTERN.match(self.comfyui.base_url):
+        if not is_valid_url(self.comfyui.base_url):
             raise ConfigValidationError(
                 f"Invalid base URL format: {self.comfyui.base_url}\n"
                 "Expected format: http://hostname:port or https://hostname"
@@ -92,9 +170,10 @@ class Config:
                 "Must be between 1 and 1440 (24 hours)."
             )
         
-        if getattr(self.prompt, 'variations_per_monitor', 1) <= 0 or getattr(self.prompt, 'variations_per_monitor', 1) > 20:
+        variations = self.prompt.variations_per_monitor
+        if variations <= 0 or variations > 20:
             raise ConfigValidationError(
-                f"variations_per_monitor out of range.\n"
+                f"variations_per_monitor ({variations}) out of range.\n"
                 "Must be between 1 and 20."
             )
         
@@ -164,7 +243,7 @@ class Config:
         
         # Fallback to first available theme with warning
         first_theme = next(iter(self.themes.values()))
-        logging.getLogger(__name__).warning(
+        logger.warning(
             f"Theme '{name}' not found, using '{first_theme.name}'"
         )
         return first_theme
@@ -186,10 +265,7 @@ class Config:
         
         Uses XDG_CONFIG_HOME if set, otherwise defaults to ~/.config.
         """
-        xdg_config = os.environ.get("XDG_CONFIG_HOME")
-        if xdg_config:
-            return Path(xdg_config) / "darkwall-comfyui"
-        return Path.home() / ".config" / "darkwall-comfyui"
+        return _config_dir_for(os.environ.get("XDG_CONFIG_HOME"), os.environ.get("HOME"))
     
     @classmethod
     def get_state_file(cls) -> Path:
@@ -197,7 +273,7 @@ class Config:
         return cls.get_config_dir() / "state.json"
     
     @classmethod
-    def initialize_config(cls, package_config_dir: Optional[Path] = None) -> None:
+    def initialize_config(cls, package_config_dir: Optional[Path] = None, force: bool = False) -> None:
         """
         Initialize user configuration directory with defaults.
         
@@ -206,20 +282,33 @@ class Config:
         
         Config templates are found via DARKWALL_CONFIG_TEMPLATES env var (set by Nix wrapper).
         
+        While config.toml exists, later runs return after a single stat; a
+        deleted config.toml is copied again. The marker file is only written
+        after a copy without errors. Set DARKWALL_FORCE_INIT=1 (or pass
+        force) to copy missing template files into an existing config.
+        
         Args:
             package_config_dir: Path to package's config directory (for finding defaults)
+            force: Copy missing template files even if config.toml exists
         """
-        logger = logging.getLogger(__name__)
         user_config_dir = cls.get_config_dir()
-        user_config_dir.mkdir(parents=True, exist_ok=True)
+        force = force or os.environ.get('DARKWALL_FORCE_INIT') == '1'
         
         # If a user config already exists, consider the config initialized and
         # avoid emitting noisy warnings about missing templates on every run.
+        # Checked before mkdir: an existing config.toml implies the directory.
         existing_config = user_config_dir / "config.toml"
-        if existing_config.exists():
-            logger.debug(f"Config already initialized at {existing_config}, skipping template copy")
+        if not force and existing_config.exists():
+            if user_config_dir not in _initialized_config_dirs:
+                logger.debug(f"Config already initialized at {existing_config}, skipping template copy")
+                if not (user_config_dir / INIT_MARKER).exists():
+                    # Configs from before the marker existed
+                    cls._mark_initialized(user_config_dir)
+                _initialized_config_dirs.add(user_config_dir)
             return
         
+        user_config_dir.mkdir(parents=True, exist_ok=True)
+        
         # Use environment variable (set by Nix wrapper)
         config_templates_dir = os.environ.get('DARKWALL_CONFIG_TEMPLATES')
         
@@ -228,24 +317,36 @@ class Config:
             logger.debug(f"Using config templates from environment: {package_config_dir}")
         
         if package_config_dir and package_config_dir.exists():
-            cls._copy_config_files(package_config_dir, user_config_dir)
+            if cls._copy_config_files(package_config_dir, user_config_dir):
+                cls._mark_initialized(user_config_dir)
+            else:
+                logger.warning(f"Some config templates could not be copied to {user_config_dir}")
         else:
             logger.warning(
                 f"Config templates not found. Set DARKWALL_CONFIG_TEMPLATES or run via 'nix run'.\n"
                 f"  Tried: {package_config_dir}"
             )
     
+    @classmethod
+    def _mark_initialized(cls, user_config_dir: Path) -> None:
+        """Record that a config directory is initialized (in-process and on disk)."""
+        _initialized_config_dirs.add(user_config_dir)
+        try:
+            (user_config_dir / INIT_MARKER).touch()
+        except OSError as e:
+            logger.debug(f"Could not write init marker: {e}")
+    
     @classmethod
     def _copy_file_mutable(cls, src: Path, dst: Path) -> None:
         """
         Copy a file ensuring the destination is mutable.
         
-        Reads content and writes to new file to avoid inheriting
-        read-only permissions from Nix store.
+        Copies content only (shutil.copyfile, which uses in-kernel copies
+        where available) so read-only permissions from the Nix store are
+        not inherited.
         """
         try:
-            content = src.read_bytes()
-            dst.write_bytes(content)
+            shutil.copyfile(src, dst)
             os.chmod(dst, 0o644)  # rw-r--r--
         except OSError as e:
             raise ConfigError(f"Failed to copy file from {src} to {dst}: {e}")
@@ -253,10 +354,13 @@ class Config:
             raise ConfigError(f"Unexpected error copying file from {src} to {dst}: {e}")
     
     @classmethod
-    def _copy_config_files(cls, source_dir: Path, target_dir: Path) -> None:
-        """Copy config files from source to target directory."""
-        logger = logging.getLogger(__name__)
+    def _copy_config_files(cls, source_dir: Path, target_dir: Path) -> bool:
+        """
+        Copy config files from source to target directory.
         
+        Returns:
+            True if every missing file was copied without errors
+        """
         try:
             target_dir.mkdir(parents=True, exist_ok=True)
             os.chmod(target_dir, 0o755)  # rwxr-xr-x
@@ -274,29 +378,41 @@ class Config:
                 cls._copy_file_mutable(src, dst)
                 logger.info(f"Copied default config: {required_file}")
         
+        complete = True
         for required_dir in required_dirs:
             src_dir = source_dir / required_dir
             dst_dir = target_dir / required_dir
             
             if src_dir.exists():
-                cls._copy_directory_recursive(src_dir, dst_dir, logger)
+                complete &= cls._copy_directory_recursive(src_dir, dst_dir, logger)
                 logger.info(f"Initialized directory: {required_dir}")
+        return complete
     
     @classmethod
-    def _copy_directory_recursive(cls, src_dir: Path, dst_dir: Path, log: 'logging.Logger') -> None:
-        """Recursively copy a directory, handling Nix store read-only files."""
-        dst_dir.mkdir(parents=True, exist_ok=True)
-        try:
-            os.chmod(dst_dir, 0o755)
-        except OSError:
-            pass
+    def _copy_directory_recursive(cls, src_dir: Path, dst_dir: Path, log: 'logging.Logger') -> bool:
+        """
+        Recursively copy a directory, handling Nix store read-only files.
+        
+        Walks the tree with os.walk so file/directory classification comes
+        from scandir entries instead of a stat per item. Symlinked
+        directories are followed, as Nix template trees may be symlink farms.
         
-        for src_item in src_dir.iterdir():
-            dst_item = dst_dir / src_item.name
+        Returns:
+            True if no file failed to copy (failures are logged, not raised)
+        """
+        complete = True
+        for root, _dirs, files in os.walk(src_dir, followlinks=True):
+            src_root = Path(root)
+            dst_root = dst_dir / src_root.relative_to(src_dir)
+            dst_root.mkdir(parents=True, exist_ok=True)
+            try:
+                os.chmod(dst_root, 0o755)
+            except OSError:
+                pass
             
-            if src_item.is_dir():
-                cls._copy_directory_recursive(src_item, dst_item, log)
-            elif src_item.is_file():
+            for name in files:
+                src_item = src_root / name
+                dst_item = dst_root / name
                 should_copy = False
                 reason = ""
                 
@@ -317,6 +433,47 @@ class Config:
                         log.debug(f"Copied {src_item.relative_to(src_dir.parent)} ({reason})")
                     except ConfigError as e:
                         log.error(f"Failed to copy {src_item.name}: {e}")
+                        complete = False
+        return complete
+    
+    @staticmethod
+    def _parse_themes(themes_raw: Dict[str, Any]) -> Dict[str, ThemeConfig]:
+        """Build ThemeConfig objects from the [themes.*] sections."""
+        themes_dict: Dict[str, ThemeConfig] = {}
+        for theme_name, theme_data in themes_raw.items():
+            if isinstance(theme_data, dict):
+                workflows_list = None
+                if 'workflows' in theme_data:
+                    workflows_list = [
+                        WeightedWorkflow.from_config(w) for w in theme_data['workflows']
+                    ]
+                
+                merged = _THEME_DEFAULTS | theme_data
+                themes_dict[theme_name] = ThemeConfig(
+                    name=theme_name,
+                    atoms_dir=merged['atoms_dir'],
+                    prompts_dir=merged['prompts_dir'],
+                    default_template=merged['default_template'],
+                    workflow_prefix=merged['workflow_prefix'],
+                    workflows=workflows_list,
+                )
+            else:
+                themes_dict[theme_name] = ThemeConfig(name=theme_name)
+        return themes_dict
+    
+    @staticmethod
+    def _parse_workflows(workflows_raw: Dict[str, Any]) -> Dict[str, WorkflowConfig]:
+        """Build WorkflowConfig objects from the [workflows.*] sections."""
+        workflows_dict: Dict[str, WorkflowConfig] = {}
+        for workflow_name, workflow_data in workflows_raw.items():
+            if isinstance(workflow_data, dict):
+                workflows_dict[workflow_name] = WorkflowConfig(
+                    name=workflow_name,
+                    prompts=workflow_data.get('prompts'),
+                )
+            else:
+                workflows_dict[workflow_name] = WorkflowConfig(name=workflow_name)
+        return workflows_dict
     
     @classmethod
     def load(
@@ -341,8 +498,6 @@ class Config:
         Returns:
             Config instance with loaded settings
         """
-        logger = logging.getLogger(__name__)
-        
         if initialize:
             cls.initialize_config()
         
@@ -350,18 +505,13 @@ class Config:
             config_file = cls.get_config_dir() / "config.toml"
         
         config_dict = {}
-        if config_file.exists():
-            try:
-                with open(config_file, 'rb') as f:
-                    config_dict = tomli.load(f)
-                
-                validate_toml_structure(config_dict, config_file)
-                
-                logger.info(f"Loaded config from {config_file}")
-            except (tomli.TOMLDecodeError, OSError, ConfigError) as e:
-                if isinstance(e, ConfigError):
-                    raise
-                logger.warning(f"Failed to load config: {e}")
+        try:
+            config_dict = _load_toml_cached(config_file)
+            logger.info(f"Loaded config from {config_file}")
+        except FileNotFoundError:
+            pass  # No config file: run on defaults
+        except (tomli.TOMLDecodeError, OSError) as e:
+            logger.warning(f"Failed to load config: {e}")
         
         # Parse monitors section
         monitors_dict = config_dict.get('monitors', {})
@@ -371,8 +521,9 @@ class Config:
         detected_monitors: List[str] = []
         if detect_monitors:
             try:
-                from ..monitor_detection import detect_monitors as do_detect
-                detected = do_detect()
+                if _detect_monitors is None:
+                    raise ImportError("monitor_detection module not available")
+                detected = _detect_monitors()
                 detected_monitors = [m.name for m in detected]
                 logger.info(f"Detected monitors: {detected_monitors}")
             except Exception as e:
@@ -380,8 +531,10 @@ class Config:
         
         # REQ-MONITOR-012: Check for unconfigured monitors
         configured_names = monitors_config.get_monitor_names()
+        configured_set = frozenset(configured_names)
+        detected_set = frozenset(detected_monitors)
         for detected_name in detected_monitors:
-            if detected_name not in configured_names:
+            if detected_name not in configured_set:
                 logger.warning(
                     f"Monitor '{detected_name}' detected but not configured. "
                     f"Add [monitors.{detected_name}] section to config. Skipping."
@@ -390,7 +543,7 @@ class Config:
         # REQ-MONITOR-013: Check for disconnected configured monitors
         active_monitors: List[str] = []
         for configured_name in configured_names:
-            if detected_monitors and configured_name not in detected_monitors:
+            if detected_set and configured_name not in detected_set:
                 logger.warning(
                     f"Monitor '{configured_name}' configured but not connected. Skipping."
                 )
@@ -402,50 +555,18 @@ class Config:
         
         # Filter prompt config to only known fields (ignore deprecated atoms_dir)
         prompt_dict = config_dict.get('prompt', {})
-        prompt_fields = {'time_slot_minutes', 'theme', 'use_monitor_seed', 'default_template', 'variations_per_monitor'}
+        prompt_fields = _field_names(PromptConfig)
         filtered_prompt = {k: v for k, v in prompt_dict.items() if k in prompt_fields}
         prompt_config = PromptConfig(**filtered_prompt)
         
         logging_config = LoggingConfig(**config_dict.get('logging', {}))
         
-        # Parse themes
-        themes_dict: Dict[str, ThemeConfig] = {}
-        if 'themes' in config_dict:
-            for theme_name, theme_data in config_dict['themes'].items():
-                if isinstance(theme_data, dict):
-                    workflows_list = None
-                    if 'workflows' in theme_data:
-                        workflows_list = [
-                            WeightedWorkflow.from_config(w) for w in theme_data['workflows']
-                        ]
-                    
-                    themes_dict[theme_name] = ThemeConfig(
-                        name=theme_name,
-                        atoms_dir=theme_data.get('atoms_dir', 'atoms'),
-                        prompts_dir=theme_data.get('prompts_dir', 'prompts'),
-                        default_template=theme_data.get('default_template', 'default.prompt'),
-                        workflow_prefix=theme_data.get('workflow_prefix'),
-                        workflows=workflows_list,
-                    )
-                else:
-                    themes_dict[theme_name] = ThemeConfig(name=theme_name)
-        
-        # Parse workflows section
-        workflows_dict: Dict[str, WorkflowConfig] = {}
-        if 'workflows' in config_dict:
-            for workflow_name, workflow_data in config_dict['workflows'].items():
-                if isinstance(workflow_data, dict):
-                    workflows_dict[workflow_name] = WorkflowConfig(
-                        name=workflow_name,
-                        prompts=workflow_data.get('prompts'),
-                    )
-                else:
-                    workflows_dict[workflow_name] = WorkflowConfig(name=workflow_name)
+        themes_dict = cls._parse_themes(config_dict.get('themes', {}))
+        workflows_dict = cls._parse_workflows(config_dict.get('workflows', {}))
         
         # Parse schedule section
         schedule_config = None
         if 'schedule' in config_dict:
-            from ..schedule import ScheduleConfig, WeightedTheme
             sched_data = config_dict['schedule']
             
             day_themes = None
@@ -476,7 +597,6 @@ class Config:
         # Parse notifications section
         notifications_config = None
         if 'notifications' in config_dict:
-            from ..notifications import NotificationConfig
             notif_data = config_dict['notifications']
             notifications_config = NotificationConfig(
                 enabled=notif_data.get('enabled', False),
@@ -4,13 +4,19 @@ State management for DarkWall ComfyUI.
 TEAM_007: Split from monolithic config.py for better organization.
 """
 
+import copy
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from .._compat import dumps, loads
 from ..exceptions import ConfigError, StateError
+from .main import Config
+
+logger = logging.getLogger(__name__)
 
 
 class NamedStateManager:
@@ -28,42 +34,81 @@ class NamedStateManager:
             monitor_names: List of compositor output names (e.g., ["DP-1", "HDMI-A-1"])
         """
         self.monitor_names = monitor_names
-        # Import here to avoid circular import
-        from .main import Config
+        # Successor of each monitor in rotation order, wrapping around
+        self._next_name: Dict[str, str] = {
+            name: monitor_names[(i + 1) % len(monitor_names)]
+            for i, name in enumerate(monitor_names)
+        }
         self.state_file = Config.get_state_file()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
+        # In-memory copy of the state file, loaded on first access and
+        # refreshed by save_state() once a write succeeds, so rotation does
+        # not re-read the file. Callers only ever see copies of it.
+        self._state: Optional[Dict[str, Any]] = None
     
     def get_state(self) -> Dict[str, Any]:
-        """Load current state."""
-        if not self.state_file.exists():
-            return {
-                'last_monitor': None,
-                'rotation_count': 0,
-                'monitor_order': self.monitor_names,
-            }
+        """
+        Get current state.
         
+        The state file is read once per instance; later calls return a copy
+        of the cached dict, which save_state() keeps in sync with disk.
+        Changes only take effect once passed to save_state().
+        """
+        if self._state is None:
+            self._state = self._read_state()
+        return copy.deepcopy(self._state)
+    
+    def _default_state(self) -> Dict[str, Any]:
+        """Get the state used before the first rotation."""
+        return {
+            'last_monitor': None,
+            'rotation_count': 0,
+            'monitor_order': self.monitor_names,
+        }
+    
+    def _read_state(self) -> Dict[str, Any]:
+        """Load state from the state file."""
+        # No exists() pre-check: a missing file is just the first run
         try:
-            with open(self.state_file, 'r', encoding='utf-8') as f:
-                state = json.load(f)
-                # Ensure monitor_order is up to date
-                state['monitor_order'] = self.monitor_names
-                return state
-        except (FileNotFoundError, json.JSONDecodeError, OSError) as e:
+            state = loads(self.state_file.read_bytes())
+        except FileNotFoundError:
+            return self._default_state()
+        except (json.JSONDecodeError, OSError) as e:
             self.logger.warning(f"Failed to load state file: {e}")
-            return {
-                'last_monitor': None,
-                'rotation_count': 0,
-                'monitor_order': self.monitor_names,
-            }
+            return self._default_state()
+        
+        # Ensure monitor_order is up to date
+        state['monitor_order'] = self.monitor_names
+        return state
     
     def save_state(self, state: Dict[str, Any]) -> None:
-        """Save current state."""
+        """
+        Save current state.
+        
+        Writes to a temporary sibling and renames it over the state file,
+        so an interrupted write never leaves a truncated state.json. If the
+        file already holds exactly these bytes the write is skipped.
+        """
+        payload = dumps(state, indent=True)
+        try:
+            if self.state_file.read_bytes() == payload:
+                self._state = copy.deepcopy(state)
+                return
+        except OSError:
+            pass
+        
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.json.tmp')
         
         try:
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2)
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, self.state_file)
+            self._state = copy.deepcopy(state)
         except (OSError, PermissionError) as e:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
             raise StateError(f"Failed to save state file {self.state_file}: {e}")
     
     def get_next_monitor(self) -> str:
@@ -79,13 +124,8 @@ class NamedStateManager:
         state = self.get_state()
         last_monitor = state.get('last_monitor')
         
-        # Find next monitor in rotation
-        if last_monitor is None or last_monitor not in self.monitor_names:
-            next_monitor = self.monitor_names[0]
-        else:
-            current_idx = self.monitor_names.index(last_monitor)
-            next_idx = (current_idx + 1) % len(self.monitor_names)
-            next_monitor = self.monitor_names[next_idx]
+        # Find next monitor in rotation (first one if last is unknown)
+        next_monitor = self._next_name.get(last_monitor, self.monitor_names[0])
         
         # Update state
         state['last_monitor'] = next_monitor
@@ -103,20 +143,11 @@ class NamedStateManager:
         state = self.get_state()
         last_monitor = state.get('last_monitor')
         
-        if last_monitor is None or last_monitor not in self.monitor_names:
-            return self.monitor_names[0]
-        
-        current_idx = self.monitor_names.index(last_monitor)
-        next_idx = (current_idx + 1) % len(self.monitor_names)
-        return self.monitor_names[next_idx]
+        return self._next_name.get(last_monitor, self.monitor_names[0])
     
     def reset_rotation(self) -> None:
         """Reset rotation state."""
-        self.save_state({
-            'last_monitor': None,
-            'rotation_count': 0,
-            'monitor_order': self.monitor_names,
-        })
+        self.save_state(self._default_state())
         self.logger.info("Reset monitor rotation state")
     
     def save_last_generation(
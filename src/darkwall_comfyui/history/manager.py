@@ -5,22 +5,67 @@ Handles saving, organizing, and managing wallpaper generation history
 with metadata, favorites, and cleanup policies.
 """
 
+import hashlib
 import json
 import logging
 import os
 import shutil
-from dataclasses import dataclass, field, asdict
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Iterable, Optional, Set
 
+from .._compat import SLOTS, dumps, loads
 from ..prompt_generator import PromptResult
 from ..config import HistoryConfig, CleanupPolicy
 from ..exceptions import DarkWallError
 from .exceptions import HistoryError, HistoryStorageError
 
 
-@dataclass
+# Seconds between refreshes of the index.json.bak copy
+INDEX_BACKUP_INTERVAL = 24 * 60 * 60
+
+# Threads used to unlink images during bulk cleanup; smaller batches
+# are deleted inline since a pool costs more than it saves there
+CLEANUP_UNLINK_WORKERS = 8
+CLEANUP_UNLINK_MIN_BATCH = 16
+
+_timestamp_key = attrgetter('timestamp')
+
+
+def _digest(data: bytes) -> str:
+    """Fingerprint index.json bytes so a journal can name its snapshot."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _write_image(path: Path, data: bytes) -> int:
+    """
+    Write image bytes straight to a file descriptor and return the size.
+    
+    History images are rarely read back, so once they are on disk the
+    kernel is told (where supported) to drop them from the page cache.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+        if hasattr(os, 'posix_fadvise'):
+            # DONTNEED only drops clean pages, so flush them first
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, written, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return written
+
+
+@dataclass(**SLOTS)
 class HistoryEntry:
     """Single wallpaper history entry with metadata."""
     timestamp: str  # ISO format
@@ -39,15 +84,34 @@ class HistoryEntry:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to JSON-serializable dict."""
-        data = asdict(self)
-        data['tags'] = list(self.tags)  # Convert set to list for JSON
-        return data
+        # Built by hand: asdict() deep-copies every field recursively
+        return {
+            'timestamp': self.timestamp,
+            'filename': self.filename,
+            'path': self.path,
+            'monitor_index': self.monitor_index,
+            'prompt_id': self.prompt_id,
+            'positive_prompt': self.positive_prompt,
+            'negative_prompt': self.negative_prompt,
+            'template': self.template,
+            'workflow': self.workflow,
+            'seed': self.seed,
+            'file_size': self.file_size,
+            'favorite': self.favorite,
+            'tags': list(self.tags),  # Convert set to list for JSON
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'HistoryEntry':
         """Create from JSON dict."""
         if 'tags' in data:
-            data['tags'] = set(data['tags'])  # Convert list back to set
+            # Convert list back to set; tags repeat across entries, so intern them
+            data['tags'] = set(map(sys.intern, data['tags']))
+        # Runs of one theme/template often repeat the same prompt text,
+        # and template/workflow paths come from a handful of files
+        for key in ('positive_prompt', 'negative_prompt', 'template', 'workflow'):
+            if isinstance(data.get(key), str):
+                data[key] = sys.intern(data[key])
         return cls(**data)
 
 
@@ -64,12 +128,23 @@ class WallpaperHistory:
         self.logger = logging.getLogger(__name__)
         self.history_dir = config.get_history_dir()
         self.index_file = self.history_dir / "index.json"
+        # Changes since index.json was last written, one JSON record per line
+        self.journal_file = self.history_dir / "index.journal"
+        self._journal_records = 0
+        # Digest of the index.json bytes the journal applies to
+        self._snapshot_digest: Optional[str] = None
         
         # Initialize history directory
         self._ensure_history_dir()
         
-        # Load existing index
+        # Load existing index, kept sorted oldest-first so listing and
+        # cleanup never need to re-sort (a no-op pass for a sorted index)
         self._entries: List[HistoryEntry] = self._load_index()
+        self._entries.sort(key=_timestamp_key)
+        # Timestamp -> entry, kept in step with _entries for O(1) lookups
+        self._by_timestamp: Dict[str, HistoryEntry] = {}
+        for entry in self._entries:
+            self._by_timestamp.setdefault(entry.timestamp, entry)
     
     def save_wallpaper(self, image_data: bytes, generation_result: Any, 
                       prompt_result: PromptResult, monitor_index: int,
@@ -105,18 +180,16 @@ class WallpaperHistory:
             timestamp = datetime.now()
             timestamp_str = timestamp.isoformat()
             
-            # Generate filename: YYYYMMDD_HHMMSS_monitor_{index}.png
-            filename = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_monitor_{monitor_index}.png"
-            
-            # Create subdirectory by date: history/YYYY/MM/
-            date_subdir = self.history_dir / timestamp.strftime('%Y') / timestamp.strftime('%m')
-            date_subdir.mkdir(parents=True, exist_ok=True)
+            # Store as history/YYYY/MM/YYYYMMDD_HHMMSS_monitor_{index}.png;
+            # one strftime call yields both the date directory and filename
+            rel_path = f"{timestamp.strftime('%Y/%m/%Y%m%d_%H%M%S')}_monitor_{monitor_index}.png"
+            filename = rel_path.rsplit('/', 1)[1]
+            image_path = self.history_dir / rel_path
+            image_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Save image
-            image_path = date_subdir / filename
             try:
-                image_path.write_bytes(image_data)
-                file_size = image_path.stat().st_size
+                file_size = _write_image(image_path, image_data)
                 self.logger.info(f"Saved wallpaper to history: {image_path}")
             except OSError as e:
                 raise HistoryStorageError(f"Failed to save wallpaper to {image_path}: {e}")
@@ -141,14 +214,15 @@ class WallpaperHistory:
                     positive_parts.append(f"[{section.upper()}]\n{prompt}")
                 if negative:
                     negative_parts.append(f"[{section.upper()}]\n{negative}")
-            positive_text = "\n\n".join(positive_parts)
-            negative_text = "\n\n".join(negative_parts)
+            # Interned so entries with identical prompts share one string
+            positive_text = sys.intern("\n\n".join(positive_parts))
+            negative_text = sys.intern("\n\n".join(negative_parts))
             
             # Create history entry
             entry = HistoryEntry(
                 timestamp=timestamp_str,
                 filename=filename,
-                path=str(image_path.relative_to(self.history_dir)),
+                path=rel_path,
                 monitor_index=monitor_index,
                 prompt_id=generation_result.prompt_id,
                 positive_prompt=positive_text,
@@ -161,7 +235,11 @@ class WallpaperHistory:
             
             # Add to index
             self._entries.append(entry)
-            self._save_index()
+            if len(self._entries) > 1 and entry.timestamp < self._entries[-2].timestamp:
+                # Clock went backwards; restore the order (near-sorted, so cheap)
+                self._entries.sort(key=_timestamp_key)
+            self._by_timestamp.setdefault(entry.timestamp, entry)
+            self._record({'op': 'add', 'entry': entry.to_dict()})
             
             # Run cleanup if needed
             self._cleanup_if_needed()
@@ -188,37 +266,32 @@ class WallpaperHistory:
         Returns:
             List of HistoryEntry (newest first)
         """
-        entries = self._entries.copy()
+        # _entries is oldest-first, so walking it backwards is newest-first
+        entries: Iterable[HistoryEntry] = reversed(self._entries)
         
         # Apply filters
         if monitor_index is not None:
-            entries = [e for e in entries if e.monitor_index == monitor_index]
+            entries = (e for e in entries if e.monitor_index == monitor_index)
         
         if favorites_only:
-            entries = [e for e in entries if e.favorite]
-        
-        # Sort by timestamp (newest first)
-        entries.sort(key=lambda e: e.timestamp, reverse=True)
+            entries = (e for e in entries if e.favorite)
         
         # Apply limit
         if limit:
-            entries = entries[:limit]
+            entries = islice(entries, limit)
         
-        return entries
+        return list(entries)
     
     def get_entry(self, timestamp: str) -> Optional[HistoryEntry]:
         """Get specific history entry by timestamp."""
-        for entry in self._entries:
-            if entry.timestamp == timestamp:
-                return entry
-        return None
+        return self._by_timestamp.get(timestamp)
     
     def set_favorite(self, timestamp: str, favorite: bool = True) -> bool:
         """Mark entry as favorite/unfavorite."""
         entry = self.get_entry(timestamp)
         if entry:
             entry.favorite = favorite
-            self._save_index()
+            self._record({'op': 'favorite', 'timestamp': timestamp, 'value': favorite})
             return True
         return False
     
@@ -239,46 +312,53 @@ class WallpaperHistory:
         if not entry:
             return False
         
-        # Delete image file
-        image_path = self.history_dir / entry.path
-        try:
-            if image_path.exists():
-                image_path.unlink()
-                self.logger.info(f"Deleted history image: {image_path}")
-        except OSError as e:
-            self.logger.warning(f"Failed to delete image file {image_path}: {e}")
-            # Continue with index removal even if file deletion fails
-        except Exception as e:
-            self.logger.warning(f"Unexpected error deleting image file {image_path}: {e}")
-            # Continue with index removal even if file deletion fails
+        # Continue with index removal even if file deletion fails
+        self._unlink_image(entry)
         
         # Remove from index
         try:
             self._entries = [e for e in self._entries if e.timestamp != timestamp]
-            self._save_index()
+            del self._by_timestamp[timestamp]
+            self._record({'op': 'delete', 'timestamp': timestamp})
         except Exception as e:
             raise HistoryError(f"Failed to remove entry from index: {e}")
         
         return True
     
+    def _unlink_image(self, entry: HistoryEntry) -> None:
+        """Delete an entry's image file, logging rather than raising on failure."""
+        image_path = self.history_dir / entry.path
+        try:
+            image_path.unlink()
+            self.logger.info(f"Deleted history image: {image_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Failed to delete image file {image_path}: {e}")
+        except Exception as e:
+            self.logger.warning(f"Unexpected error deleting image file {image_path}: {e}")
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get history statistics."""
-        total_entries = len(self._entries)
-        total_size = sum(e.file_size for e in self._entries)
-        favorite_count = sum(1 for e in self._entries if e.favorite)
+        total_size = 0
+        favorite_count = 0
+        monitor_counts: Dict[int, int] = {}
         
-        # Monitor breakdown
-        monitor_counts = {}
+        # One pass for sizes, favorites and the monitor breakdown
         for entry in self._entries:
+            total_size += entry.file_size
+            if entry.favorite:
+                favorite_count += 1
             monitor_counts[entry.monitor_index] = monitor_counts.get(entry.monitor_index, 0) + 1
         
         return {
-            'total_entries': total_entries,
+            'total_entries': len(self._entries),
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'favorite_count': favorite_count,
             'monitor_counts': monitor_counts,
-            'oldest_entry': min((e.timestamp for e in self._entries), default=None),
-            'newest_entry': max((e.timestamp for e in self._entries), default=None),
+            # _entries is sorted oldest first
+            'oldest_entry': self._entries[0].timestamp if self._entries else None,
+            'newest_entry': self._entries[-1].timestamp if self._entries else None,
         }
     
     def cleanup(self, policy: Optional[CleanupPolicy] = None) -> int:
@@ -300,26 +380,29 @@ class WallpaperHistory:
             return 0
         
         try:
-            # Sort entries by timestamp (oldest first for deletion)
-            sorted_entries = sorted(self._entries, key=lambda e: e.timestamp)
-            total_size_mb = sum(e.file_size for e in self._entries) / (1024 * 1024)
-            
-            entries_to_delete = []
-            
-            for entry in sorted_entries:
-                # Check if we should keep this entry
-                if not cleanup_policy.should_keep(entry, self._entries, total_size_mb):
-                    entries_to_delete.append(entry)
-            
-            # Delete entries
-            deleted_count = 0
+            entries_to_delete = self._select_for_cleanup(cleanup_policy)
+            if not entries_to_delete:
+                return 0
+            
+            # Delete in bulk: unlink files, drop them from the index in one
+            # pass and write the index once rather than once per entry.
+            # unlink() releases the GIL, so large batches overlap their
+            # syscalls on slow or network filesystems.
+            if len(entries_to_delete) >= CLEANUP_UNLINK_MIN_BATCH:
+                with ThreadPoolExecutor(max_workers=CLEANUP_UNLINK_WORKERS) as pool:
+                    # _unlink_image logs failures itself and never raises
+                    list(pool.map(self._unlink_image, entries_to_delete))
+            else:
+                for entry in entries_to_delete:
+                    self._unlink_image(entry)
+            
+            condemned = {id(entry) for entry in entries_to_delete}
+            self._entries = [e for e in self._entries if id(e) not in condemned]
             for entry in entries_to_delete:
-                try:
-                    if self.delete_entry(entry.timestamp):
-                        deleted_count += 1
-                except Exception as e:
-                    self.logger.warning(f"Failed to delete entry {entry.timestamp} during cleanup: {e}")
-                    # Continue with other entries
+                if self._by_timestamp.get(entry.timestamp) is entry:
+                    del self._by_timestamp[entry.timestamp]
+            self._save_index()
+            deleted_count = len(entries_to_delete)
             
             self.logger.info(f"Cleanup completed: deleted {deleted_count} entries")
             return deleted_count
@@ -327,6 +410,39 @@ class WallpaperHistory:
         except Exception as e:
             raise HistoryError(f"Cleanup failed: {e}")
     
+    def _select_for_cleanup(self, policy: CleanupPolicy) -> List[HistoryEntry]:
+        """
+        Pick the entries a cleanup policy would delete.
+        
+        REQ-HIST-003: Walks the history newest first once, keeping a
+        running count and size, so every limit is checked in O(1) per
+        entry. The newest min_favorites favorites are always kept (and
+        still count towards the other limits).
+        """
+        cutoff = None
+        if policy.max_days is not None:
+            # ISO timestamps compare correctly as strings
+            cutoff = (datetime.now() - timedelta(days=policy.max_days)).isoformat()
+        max_bytes = policy.max_size_mb * 1024 * 1024 if policy.max_size_mb is not None else None
+        favorites_left = policy.min_favorites or 0
+        
+        kept_count = 0
+        kept_size = 0
+        condemned = []
+        for entry in reversed(self._entries):
+            if entry.favorite and favorites_left > 0:
+                favorites_left -= 1
+            elif (
+                (cutoff is not None and entry.timestamp < cutoff)
+                or (policy.max_count is not None and kept_count >= policy.max_count)
+                or (max_bytes is not None and kept_size + entry.file_size > max_bytes)
+            ):
+                condemned.append(entry)
+                continue
+            kept_count += 1
+            kept_size += entry.file_size
+        return condemned
+    
     def _ensure_history_dir(self) -> None:
         """
         Ensure history directory exists and is writable.
@@ -348,7 +464,7 @@ class WallpaperHistory:
     
     def _load_index(self) -> List[HistoryEntry]:
         """
-        Load history index from file.
+        Load history index from file, then replay the journal on top.
         
         Returns:
             List of history entries (empty if file not found or invalid)
@@ -356,11 +472,17 @@ class WallpaperHistory:
         Raises:
             HistoryStorageError: If critical file system errors occur
         """
+        return self._replay_journal(self._load_snapshot())
+    
+    def _load_snapshot(self) -> List[HistoryEntry]:
+        """Load the full index.json snapshot."""
         if not self.index_file.exists():
             return []
         
         try:
-            data = json.loads(self.index_file.read_text(encoding='utf-8'))
+            raw = self.index_file.read_bytes()
+            self._snapshot_digest = _digest(raw)
+            data = loads(raw)
             
             # Validate data structure
             if not isinstance(data, list):
@@ -388,9 +510,91 @@ class WallpaperHistory:
             self.logger.warning(f"Unexpected error loading history index: {e}")
             return []
     
+    def _replay_journal(self, entries: List[HistoryEntry]) -> List[HistoryEntry]:
+        """
+        Apply journal records written since the snapshot to its entries.
+        
+        The journal's first line names the digest of the index.json it was
+        written against. A journal left behind by a crash between rewriting
+        index.json and removing the journal names the old snapshot, so it is
+        discarded rather than replayed over changes it already contains.
+        """
+        try:
+            lines = self.journal_file.read_bytes().splitlines()
+        except FileNotFoundError:
+            return entries
+        except OSError as e:
+            self.logger.warning(f"Failed to read history journal, ignoring it: {e}")
+            return entries
+        
+        try:
+            header = loads(lines[0]) if lines else None
+            base = header['snapshot'] if header['op'] == 'base' else object()
+        except (json.JSONDecodeError, KeyError, TypeError):
+            base = object()
+        if base != self._snapshot_digest:
+            self.logger.warning("Discarding history journal written against an older index")
+            self._discard_journal()
+            return entries
+        
+        by_timestamp = {e.timestamp: e for e in entries}
+        for i, line in enumerate(lines[1:], 1):
+            try:
+                record = loads(line)
+                op = record['op']
+                if op == 'add':
+                    entry = HistoryEntry.from_dict(record['entry'])
+                    by_timestamp.setdefault(entry.timestamp, entry)
+                elif op == 'favorite':
+                    if record['timestamp'] in by_timestamp:
+                        by_timestamp[record['timestamp']].favorite = record['value']
+                elif op == 'delete':
+                    by_timestamp.pop(record['timestamp'], None)
+                else:
+                    raise ValueError(f"unknown op {op!r}")
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                # A torn last line after a crash lands here too
+                self.logger.warning(f"Skipping invalid history journal record {i}: {e}")
+        
+        self._journal_records = len(lines) - 1
+        self.logger.debug(f"Replayed {self._journal_records} history journal records")
+        return list(by_timestamp.values())
+    
+    def _record(self, record: Dict[str, Any]) -> None:
+        """
+        Persist one change by appending it to the journal.
+        
+        Once the journal holds more than a quarter as many records as there
+        are entries, the full index is rewritten instead, so writes stay
+        amortized O(1) per change and the journal stays short.
+        
+        Raises:
+            HistoryStorageError: If writing fails
+        """
+        if self._journal_records + 1 > len(self._entries) // 4:
+            self._save_index()
+            return
+        
+        try:
+            if self._journal_records == 0:
+                # Start a fresh journal tied to the current snapshot
+                header = {'op': 'base', 'snapshot': self._snapshot_digest}
+                self.journal_file.write_bytes(dumps(header) + b'\n' + dumps(record) + b'\n')
+            else:
+                with self.journal_file.open('ab') as f:
+                    f.write(dumps(record) + b'\n')
+            self._journal_records += 1
+        except OSError as e:
+            raise HistoryStorageError(f"Failed to append to history journal {self.journal_file}: {e}")
+    
+    def _discard_journal(self) -> None:
+        """Remove the journal so the next record starts a fresh one."""
+        self.journal_file.unlink(missing_ok=True)
+        self._journal_records = 0
+    
     def _save_index(self) -> None:
         """
-        Save history index to file.
+        Save the full history index to file and clear the journal.
         
         Raises:
             HistoryStorageError: If saving fails
@@ -398,16 +602,30 @@ class WallpaperHistory:
         try:
             data = [entry.to_dict() for entry in self._entries]
             
-            # Create backup before overwriting
-            if self.index_file.exists():
-                backup_file = self.index_file.with_suffix('.json.bak')
+            # The rename below already makes the write crash-safe, so the
+            # .bak copy is only refreshed once it is older than a day
+            backup_file = self.index_file.with_suffix('.json.bak')
+            try:
+                backup_age = time.time() - backup_file.stat().st_mtime
+            except FileNotFoundError:
+                backup_age = None
+            if backup_age is None or backup_age > INDEX_BACKUP_INTERVAL:
                 try:
-                    shutil.copy2(self.index_file, backup_file)
+                    shutil.copyfile(self.index_file, backup_file)
+                except FileNotFoundError:
+                    pass  # No index yet
                 except OSError as e:
                     self.logger.warning(f"Failed to create index backup: {e}")
             
-            # Write new index
-            self.index_file.write_text(json.dumps(data, indent=2), encoding='utf-8')
+            # Write new index to a sibling and atomically swap it in
+            payload = dumps(data)
+            tmp_file = self.index_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, self.index_file)
+            self._snapshot_digest = _digest(payload)
+            # Everything in the journal is now part of index.json; if this
+            # unlink never happens the stale journal is discarded on load
+            self._discard_journal()
             self.logger.debug(f"Saved {len(self._entries)} entries to history index")
             
         except (OSError, UnicodeEncodeError) as e:
@@ -422,8 +640,11 @@ class WallpaperHistory:
         Raises:
             HistoryError: If cleanup fails critically
         """
+        # Allow some slack past max_entries so an over-limit history is
+        # trimmed in batches rather than on every single save
+        slack = max(16, self.config.max_entries // 32)
         try:
-            if len(self._entries) > self.config.max_entries:
+            if len(self._entries) > self.config.max_entries + slack:
                 self.logger.info(f"History exceeds max entries ({len(self._entries)} > {self.config.max_entries}), running cleanup")
                 self.cleanup()
         except Exception as e:
@@ -8,11 +8,12 @@ REQ-MONITOR-011: Monitor Detection Caching
 """
 
 import logging
+import os
 import re
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from .exceptions import (
     MonitorDetectionError,
@@ -23,6 +24,35 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Environment variables each compositor exports to its clients. A value can
+# outlive the compositor (systemd user sessions, tmux, ssh), so it is only
+# trusted when the IPC socket it names exists; see _compositor_socket_exists.
+_COMPOSITOR_ENV = {
+    "niri": "NIRI_SOCKET",
+    "sway": "SWAYSOCK",
+    "hyprland": "HYPRLAND_INSTANCE_SIGNATURE",
+    "Hyprland": "HYPRLAND_INSTANCE_SIGNATURE",
+}
+
+
+def _compositor_socket_exists(process_name: str) -> bool:
+    """Check whether the compositor's environment variable names a live socket path."""
+    env_var = _COMPOSITOR_ENV.get(process_name)
+    value = os.environ.get(env_var) if env_var else None
+    if not value:
+        return False
+    
+    if env_var == "HYPRLAND_INSTANCE_SIGNATURE":
+        # Hyprland exports a signature; its socket lives under the runtime
+        # dir (Hyprland >= 0.40) or /tmp/hypr (older releases)
+        candidates = [Path("/tmp/hypr") / value / ".socket.sock"]
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime_dir:
+            candidates.insert(0, Path(runtime_dir) / "hypr" / value / ".socket.sock")
+    else:
+        candidates = [Path(value)]
+    return any(path.exists() for path in candidates)
+
 
 @dataclass
 class Monitor:
@@ -49,6 +79,8 @@ class MonitorDetector:
     def __init__(self) -> None:
         self._cache: Optional[List[Monitor]] = None
         self._compositor: Optional[str] = None
+        # Process names from one /proc scan, valid during _detect_compositor()
+        self._process_names: Optional[FrozenSet[str]] = None
     
     def detect(self, force_refresh: bool = False) -> List[Monitor]:
         """
@@ -105,17 +137,21 @@ class MonitorDetector:
         
         REQ-MONITOR-010: Error with clear message if no compositor found.
         """
-        # Check for niri first (user's compositor)
-        if self._is_running("niri"):
-            return "niri"
-        
-        # Check for sway
-        if self._is_running("sway"):
-            return "sway"
-        
-        # Check for hyprland
-        if self._is_running("hyprland") or self._is_running("Hyprland"):
-            return "hyprland"
+        try:
+            # Check for niri first (user's compositor)
+            if self._is_running("niri"):
+                return "niri"
+            
+            # Check for sway
+            if self._is_running("sway"):
+                return "sway"
+            
+            # Check for hyprland
+            if self._is_running("hyprland") or self._is_running("Hyprland"):
+                return "hyprland"
+        finally:
+            # Processes may have changed by the next detection
+            self._process_names = None
         
         raise CompositorNotFoundError(
             "Could not detect monitors: No supported compositor running.\n"
@@ -124,7 +160,23 @@ class MonitorDetector:
         )
     
     def _is_running(self, process_name: str) -> bool:
-        """Check if a process is running."""
+        """
+        Check if a process is running.
+        
+        Checks the socket named by the compositor's environment variable
+        first, then the names
+        from a single /proc/*/comm scan shared by all checks of one
+        detection (an exact match, as pgrep -x compares). Falls back to
+        pgrep where /proc is not available.
+        """
+        if _compositor_socket_exists(process_name):
+            return True
+        
+        if self._process_names is None:
+            self._process_names = self._scan_process_names()
+        if self._process_names is not None:
+            return process_name in self._process_names
+        
         try:
             result = subprocess.run(
                 ["pgrep", "-x", process_name],
@@ -135,6 +187,30 @@ class MonitorDetector:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
     
+    def _scan_process_names(self) -> Optional[FrozenSet[str]]:
+        """
+        Collect the names of running processes from /proc/*/comm.
+        
+        Returns:
+            Set of process names, or None if /proc is not available
+        """
+        names = set()
+        try:
+            with os.scandir("/proc") as entries:
+                for entry in entries:
+                    if not entry.name.isdigit():
+                        continue
+                    try:
+                        with open(f"/proc/{entry.name}/comm") as f:
+                            names.add(f.read().rstrip("\n"))
+                    except OSError:
+                        # Process exited mid-scan or is not readable
+                        continue
+        except OSError:
+            return None
+        # No readable process at all means this is not a Linux-style /proc
+        return frozenset(names) if names else None
+    
     def _detect_niri(self) -> List[Monitor]:
         """
         Detect monitors from niri compositor.
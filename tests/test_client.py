@@ -286,12 +286,63 @@ def test_wait_for_result_uses_websocket_and_history(comfyui_config):
 
     # TEAM_007: Patch websocket in transport module where it's used
     with patch("darkwall_comfyui.comfy.transport.websocket.create_connection", return_value=ws_mock), \
-         patch.object(client._transport, "get_history", return_value=history):
+         patch.object(client._transport, "get_history", side_effect=[None, history]):
         result = client._wait_for_result(prompt_id)
 
     assert result["filename"] == "test.png"
     assert result["subfolder"] == "sub"
     assert result["type"] == "output"
+    assert ws_mock.recv.call_count == 2
+    ws_mock.close.assert_called_once()
+
+
+def test_wait_for_result_already_finished(comfyui_config):
+    """A prompt that finished before the WebSocket opened is read from history."""
+    client = ComfyClient(comfyui_config)
+    ws_mock = Mock()
+    history = {
+        "outputs": {
+            "1": {"images": [{"filename": "done.png", "subfolder": "", "type": "output"}]}
+        }
+    }
+
+    with patch("darkwall_comfyui.comfy.transport.websocket.create_connection", return_value=ws_mock), \
+         patch.object(client._transport, "get_history", return_value=history):
+        result = client._wait_for_result("prompt-123")
+
+    assert result["filename"] == "done.png"
+    ws_mock.recv.assert_not_called()
+    ws_mock.close.assert_called_once()
+
+
+def test_wait_for_results_shares_one_websocket(comfyui_config):
+    """Several queued prompts are watched over one socket and dispatched by prompt_id."""
+    client = ComfyClient(comfyui_config)
+    events = [
+        {"type": "executing", "data": {"prompt_id": "a", "node": "3"}},
+        {"type": "executing", "data": {"prompt_id": "b", "node": None}},
+        {"type": "execution_error", "data": {"prompt_id": "a", "node_type": "KSampler",
+                                             "exception_message": "out of memory"}},
+    ]
+    ws_mock = Mock()
+    ws_mock.recv.side_effect = [json.dumps(e) for e in events]
+    history = {
+        "outputs": {
+            "1": {"images": [{"filename": "b.png", "subfolder": "", "type": "output"}]}
+        }
+    }
+    seen = []
+
+    with patch("darkwall_comfyui.comfy.transport.websocket.create_connection",
+               return_value=ws_mock) as create_connection, \
+         patch.object(client._transport, "get_history", side_effect=[None, None, history]):
+        results = list(client._transport.wait_for_results(["a", "b"], on_event=seen.append))
+
+    create_connection.assert_called_once()
+    assert [prompt_id for prompt_id, _ in results] == ["b", "a"]
+    assert results[0][1]["filename"] == "b.png"
+    assert isinstance(results[1][1], ComfyGenerationError)
+    assert seen == events
     ws_mock.close.assert_called_once()
 
 
@@ -0,0 +1,203 @@
+"""Tests for config loading internals."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from darkwall_comfyui.config import main as config_main
+from darkwall_comfyui.exceptions import ConfigError
+from darkwall_comfyui.config.dataclasses import (
+    PerMonitorConfig,
+    ThemeConfig,
+    WeightedWorkflow,
+    WorkflowConfig,
+)
+
+
+class TestTomlCache:
+    """Test mtime-keyed caching of parsed TOML."""
+
+    def test_returns_copy_of_cached_dict(self, tmp_path: Path):
+        """Mutating a returned dict must not affect later loads."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text('[prompt]\ntheme = "dark"\n')
+
+        first = config_main._load_toml_cached(config_file)
+        first['prompt']['theme'] = "mutated"
+
+        second = config_main._load_toml_cached(config_file)
+        assert second['prompt']['theme'] == "dark"
+
+    def test_reparses_when_file_changes(self, tmp_path: Path):
+        """A changed file is parsed again instead of served from cache."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text('[prompt]\ntheme = "dark"\n')
+        assert config_main._load_toml_cached(config_file)['prompt']['theme'] == "dark"
+
+        config_file.write_text('[prompt]\ntheme = "light"\n')
+        st = config_file.stat()
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert config_main._load_toml_cached(config_file)['prompt']['theme'] == "light"
+
+    def test_invalid_file_is_not_cached(self, tmp_path: Path):
+        """Validation errors are raised on every load, never cached away."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text('[bogus]\nkey = 1\n')
+
+        for _ in range(2):
+            with pytest.raises(ConfigError):
+                config_main._load_toml_cached(config_file)
+        assert config_file not in config_main._toml_cache
+
+
+class TestInitializeMarker:
+    """Test the first-run marker used to skip initialize_config."""
+
+    @pytest.fixture
+    def templates_dir(self, tmp_path: Path) -> Path:
+        """Create a minimal template directory."""
+        templates = tmp_path / "templates"
+        templates.mkdir()
+        (templates / "config.toml").write_text('[prompt]\ntheme = "dark"\n')
+        return templates
+
+    @pytest.fixture
+    def user_dir(self, tmp_path: Path, monkeypatch, templates_dir: Path) -> Path:
+        """Point XDG_CONFIG_HOME and the templates env var at tmp_path."""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "xdg"))
+        monkeypatch.setenv("DARKWALL_CONFIG_TEMPLATES", str(templates_dir))
+        monkeypatch.delenv("DARKWALL_FORCE_INIT", raising=False)
+        monkeypatch.setattr(config_main, "_initialized_config_dirs", set())
+        return tmp_path / "xdg" / "darkwall-comfyui"
+
+    def test_deleted_config_is_restored(self, user_dir: Path):
+        """The marker alone never stops a missing config.toml from being copied."""
+        config_main.Config.initialize_config()
+        assert (user_dir / config_main.INIT_MARKER).exists()
+
+        (user_dir / "config.toml").unlink()
+        config_main.Config.initialize_config()
+        assert (user_dir / "config.toml").exists()
+
+    def test_partial_copy_writes_no_marker(self, user_dir: Path, templates_dir: Path, monkeypatch):
+        """A copy that failed for some files is not recorded as initialized."""
+        (templates_dir / "workflows").mkdir()
+        (templates_dir / "workflows" / "default.json").write_text("{}")
+        copy_file = config_main.Config._copy_file_mutable
+
+        def failing_copy(src, dst):
+            if src.suffix == ".json":
+                raise ConfigError(f"Failed to copy file from {src} to {dst}")
+            copy_file(src, dst)
+
+        monkeypatch.setattr(config_main.Config, "_copy_file_mutable", failing_copy)
+        config_main.Config.initialize_config()
+        assert (user_dir / "config.toml").exists()
+        assert not (user_dir / config_main.INIT_MARKER).exists()
+
+    def test_force_copies_missing_templates(self, user_dir: Path, templates_dir: Path, monkeypatch):
+        """force=True and DARKWALL_FORCE_INIT=1 fill in files around an existing config."""
+        (templates_dir / "themes").mkdir()
+        (templates_dir / "themes" / "dark.txt").write_text("atoms")
+        config_main.Config.initialize_config()
+        theme_file = user_dir / "themes" / "dark.txt"
+
+        theme_file.unlink()
+        config_main.Config.initialize_config()
+        assert not theme_file.exists()
+
+        config_main.Config.initialize_config(force=True)
+        assert theme_file.exists()
+
+        theme_file.unlink()
+        monkeypatch.setenv("DARKWALL_FORCE_INIT", "1")
+        config_main.Config.initialize_config()
+        assert theme_file.exists()
+
+
+class TestConfigDirCache:
+    """Test the environment-keyed config directory cache."""
+
+    def test_follows_xdg_config_home(self, tmp_path: Path, monkeypatch):
+        """Changing XDG_CONFIG_HOME is picked up despite caching."""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "a"))
+        assert config_main.Config.get_config_dir() == tmp_path / "a" / "darkwall-comfyui"
+
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "b"))
+        assert config_main.Config.get_config_dir() == tmp_path / "b" / "darkwall-comfyui"
+        assert config_main.Config.get_state_file() == tmp_path / "b" / "darkwall-comfyui" / "state.json"
+
+
+class TestWorkflowSelection:
+    """Test weighted workflow prefix selection on ThemeConfig."""
+
+    def test_weighted_choice_only_returns_weighted_prefixes(self):
+        """Zero-weight prefixes are never selected."""
+        theme = ThemeConfig(
+            name="dark",
+            workflows=[WeightedWorkflow("a", 1.0), WeightedWorkflow("b", 0.0)],
+        )
+        assert {theme.select_workflow_prefix() for _ in range(50)} == {"a"}
+
+    def test_falls_back_without_positive_weights(self):
+        """With no usable weights the prefix or theme name is used."""
+        theme = ThemeConfig(name="dark", workflows=[WeightedWorkflow("a", 0.0)])
+        assert theme.select_workflow_prefix() == "dark"
+        assert ThemeConfig(name="dark", workflow_prefix="z").select_workflow_prefix() == "z"
+
+    def test_large_lists_use_alias_table(self):
+        """Long workflow lists sample via the alias table and honor weights."""
+        workflows = [WeightedWorkflow(f"w{i}", 0.0) for i in range(20)]
+        workflows[7] = WeightedWorkflow("w7", 2.0)
+        workflows[13] = WeightedWorkflow("w13", 2.0)
+        theme = ThemeConfig(name="dark", workflows=workflows)
+
+        assert theme._alias_table is not None
+        assert {theme.select_workflow_prefix() for _ in range(200)} == {"w7", "w13"}
+
+    def test_weights_display_percentages(self):
+        """Weights are shown as shares of the total."""
+        theme = ThemeConfig(
+            name="dark",
+            workflows=[WeightedWorkflow("a", 3.0), WeightedWorkflow("b", 1.0)],
+        )
+        assert theme.get_workflow_weights_display() == "a: 75%, b: 25%"
+
+
+class TestPerMonitorWorkflowPath:
+    """Test workflow path resolution for a monitor."""
+
+    def test_explicit_workflow_gets_json_suffix_once(self, tmp_path: Path):
+        """Workflow IDs with or without .json resolve to the same file."""
+        for workflow in ("default", "default.json"):
+            monitor = PerMonitorConfig(name="DP-1", workflow=workflow)
+            assert monitor.get_workflow_path(tmp_path) == tmp_path / "workflows" / "default.json"
+
+    def test_theme_prefix_with_resolution(self, tmp_path: Path):
+        """A theme prefix plus monitor resolution selects the workflow."""
+        monitor = PerMonitorConfig(name="DP-1", resolution="1920x1080")
+        theme = ThemeConfig(name="dark", workflow_prefix="z-image")
+        assert monitor.get_workflow_path(tmp_path, theme) == tmp_path / "workflows" / "z-image-1920x1080.json"
+
+    def test_output_path_follows_home(self, tmp_path: Path, monkeypatch):
+        """~ in output paths expands against the current HOME."""
+        monitor = PerMonitorConfig(name="DP-1")
+        monkeypatch.setenv("HOME", str(tmp_path / "a"))
+        assert monitor.get_output_path() == tmp_path / "a" / "Pictures" / "wallpapers" / "DP-1.png"
+
+        monkeypatch.setenv("HOME", str(tmp_path / "b"))
+        assert monitor.get_output_path() == tmp_path / "b" / "Pictures" / "wallpapers" / "DP-1.png"
+
+
+class TestWorkflowPromptFilter:
+    """Test WorkflowConfig.filter_prompts."""
+
+    def test_filter_modes(self):
+        """None and ["*"] keep everything, a list keeps only its entries."""
+        available = ["a.prompt", "b.prompt", "c.prompt"]
+        assert WorkflowConfig(name="w").filter_prompts(available) == available
+        assert WorkflowConfig(name="w", prompts=["*"]).filter_prompts(available) == available
+        assert WorkflowConfig(name="w", prompts=["c.prompt", "a.prompt"]).filter_prompts(available) == ["a.prompt", "c.prompt"]
+        assert WorkflowConfig(name="w", prompts=[]).filter_prompts(available) == []
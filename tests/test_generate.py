@@ -0,0 +1,164 @@
+"""Tests for the multi-monitor generation command."""
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from darkwall_comfyui.commands import generate
+from darkwall_comfyui.commands.generate import _GenerationContext, _GenerationJob
+from darkwall_comfyui.exceptions import ComfyConnectionError, ComfyTimeoutError
+
+
+def _job(monitor_name: str, workflow_path: str = "/workflows/default.json") -> _GenerationJob:
+    """Build a planned job without running the planner."""
+    return _GenerationJob(
+        monitor_name=monitor_name,
+        theme_name="dark",
+        workflow_id="default",
+        workflow_path=workflow_path,
+        template_path="default.prompt",
+        output_path=Path(f"/tmp/{monitor_name}.png"),
+        prompts=Mock(),
+        monitor_seed_offset=0,
+        base_seed=0,
+    )
+
+
+@pytest.fixture
+def context() -> _GenerationContext:
+    """A generation context with mocked collaborators."""
+    client = Mock()
+    client.health_check.return_value = True
+    workflow_mgr = Mock()
+    workflow_mgr.load.side_effect = lambda path, config_dir: {"path": str(path)}
+    return _GenerationContext(client=client, target=Mock(), workflow_mgr=workflow_mgr)
+
+
+@pytest.fixture
+def config() -> Mock:
+    """A config with three active monitors."""
+    config = Mock()
+    config.get_active_monitor_names.return_value = ["DP-1", "DP-2", "HDMI-A-1"]
+    return config
+
+
+def _run_generate_all(config, context, jobs):
+    """Run generate_all with planning and finishing replaced by mocks."""
+    finished = []
+    with patch.object(_GenerationContext, "from_config", return_value=context), \
+         patch.object(generate, "_plan_generation",
+                      side_effect=lambda config, name, context: jobs[name]), \
+         patch.object(generate, "_finish_generation",
+                      side_effect=lambda config, job, result, context: finished.append((job, result))):
+        try:
+            generate.generate_all(config)
+        except generate.GenerationError as e:
+            return finished, e
+    return finished, None
+
+
+class TestGenerationContext:
+    """Test collaborators shared across monitors."""
+
+    def test_health_check_runs_once_for_all_monitors(self, config, context):
+        """ComfyUI is probed once however many monitors are generated."""
+        jobs = {name: _job(name) for name in config.get_active_monitor_names()}
+        context.client.submit.side_effect = ["p1", "p2", "p3"]
+        context.client.wait_for_images.return_value = iter(
+            [(prompt_id, Mock()) for prompt_id in ("p1", "p2", "p3")]
+        )
+
+        finished, error = _run_generate_all(config, context, jobs)
+
+        assert error is None
+        assert len(finished) == 3
+        context.client.health_check.assert_called_once()
+        # All three monitors use one workflow file, parsed once
+        context.workflow_mgr.load.assert_called_once()
+
+    def test_prompt_generators_are_cached_per_theme(self, context):
+        """Each theme's prompt generator is built once."""
+        with patch.object(generate.PromptGenerator, "from_config",
+                          side_effect=lambda config, theme: Mock(theme=theme)) as from_config:
+            dark = context.prompt_generator(Mock(), "dark")
+            assert context.prompt_generator(Mock(), "dark") is dark
+            assert context.prompt_generator(Mock(), "light") is not dark
+
+        assert from_config.call_count == 2
+
+    def test_history_is_opened_on_first_save(self, context):
+        """A bad history directory cannot fail the run before generation."""
+        with patch.object(generate, "WallpaperHistory") as history_cls:
+            assert not history_cls.called
+            history = context.history
+            assert context.history is history
+
+        history_cls.assert_called_once_with(None)
+
+
+class TestGenerateAll:
+    """Test queueing every monitor and waiting over one WebSocket."""
+
+    def test_failed_submit_does_not_stop_other_monitors(self, config, context):
+        """A monitor whose submit fails is reported; the rest are generated."""
+        jobs = {name: _job(name) for name in config.get_active_monitor_names()}
+        context.client.submit.side_effect = ["p1", ComfyConnectionError("refused"), "p3"]
+        context.client.wait_for_images.return_value = iter([("p1", Mock()), ("p3", Mock())])
+
+        finished, error = _run_generate_all(config, context, jobs)
+
+        assert context.client.wait_for_images.call_args.args[0] == ["p1", "p3"]
+        assert [job.monitor_name for job, _ in finished] == ["DP-1", "HDMI-A-1"]
+        assert "1/3" in str(error)
+        assert "Monitor DP-2: refused" in str(error)
+
+    def test_results_are_matched_to_jobs_by_prompt_id(self, config, context):
+        """Results arriving out of order reach the job that queued them."""
+        jobs = {name: _job(name) for name in config.get_active_monitor_names()}
+        context.client.submit.side_effect = ["p1", "p2", "p3"]
+        results = {"p1": Mock(name="r1"), "p3": Mock(name="r3")}
+        context.client.wait_for_images.return_value = iter([
+            ("p3", results["p3"]),
+            ("p2", ComfyTimeoutError("timed out")),
+            ("p1", results["p1"]),
+        ])
+
+        finished, error = _run_generate_all(config, context, jobs)
+
+        assert [(job.monitor_name, result) for job, result in finished] == [
+            ("HDMI-A-1", results["p3"]),
+            ("DP-1", results["p1"]),
+        ]
+        assert "Monitor DP-2: timed out" in str(error)
+
+    def test_websocket_failure_fails_every_pending_monitor(self, config, context):
+        """If the WebSocket cannot be opened, no queued monitor is dropped."""
+        jobs = {name: _job(name) for name in config.get_active_monitor_names()}
+        context.client.submit.side_effect = ["p1", "p2", "p3"]
+
+        def no_websocket(prompt_ids, on_event=None):
+            raise ComfyConnectionError("no websocket")
+            yield  # pragma: no cover - makes this a generator like the real one
+
+        context.client.wait_for_images.side_effect = no_websocket
+
+        finished, error = _run_generate_all(config, context, jobs)
+
+        assert finished == []
+        assert "3/3" in str(error)
+        for name in ("DP-1", "DP-2", "HDMI-A-1"):
+            assert f"Monitor {name}: no websocket" in str(error)
+
+    def test_ws_events_are_dispatched_by_prompt_id(self):
+        """Each prompt's events reach only that prompt's handler."""
+        handlers = {"p1": Mock(), "p2": Mock()}
+        dispatch = generate._dispatch_ws_events(handlers)
+        event = {"type": "executing", "data": {"prompt_id": "p2", "node": "3"}}
+
+        dispatch(event)
+        dispatch({"type": "status", "data": {"status": {}}})
+        dispatch("not json")
+
+        handlers["p1"].assert_not_called()
+        handlers["p2"].assert_called_once_with(event)
@@ -2,7 +2,8 @@
 
 import json
 import tempfile
-from datetime import datetime
+from dataclasses import fields
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -11,6 +12,7 @@ import pytest
 from darkwall_comfyui.config import HistoryConfig, CleanupPolicy
 from darkwall_comfyui.history import WallpaperHistory, HistoryEntry
 from darkwall_comfyui.history.exceptions import HistoryError, HistoryStorageError
+from darkwall_comfyui.history.manager import CLEANUP_UNLINK_MIN_BATCH
 from darkwall_comfyui.prompt_generator import PromptResult
 from darkwall_comfyui.comfy.client import GenerationResult
 
@@ -44,6 +46,19 @@ class TestHistoryEntry:
         assert isinstance(result["tags"], list)
         assert set(result["tags"]) == {"test", "wallpaper"}
     
+    def test_to_dict_covers_all_fields(self):
+        """Every dataclass field is serialized."""
+        entry = HistoryEntry(
+            timestamp="2025-01-01T12:00:00",
+            filename="test.png",
+            path="2025/01/test.png",
+            monitor_index=0,
+            prompt_id="test-prompt-id",
+            positive_prompt="test prompt",
+        )
+        
+        assert set(entry.to_dict()) == {f.name for f in fields(HistoryEntry)}
+    
     def test_from_dict(self):
         """Test creation from JSON dict."""
         data = {
@@ -69,6 +84,25 @@ class TestHistoryEntry:
         assert entry.favorite is True
         assert isinstance(entry.tags, set)
         assert entry.tags == {"test", "wallpaper"}
+    
+    def test_from_dict_shares_prompt_strings(self):
+        """Entries loaded with equal prompts or paths reference one string."""
+        def load():
+            return HistoryEntry.from_dict(json.loads(json.dumps({
+                "timestamp": "2025-01-01T12:00:00",
+                "filename": "test.png",
+                "path": "2025/01/test.png",
+                "monitor_index": 0,
+                "prompt_id": "test-prompt-id",
+                "positive_prompt": "a long prompt " * 8,
+                "negative_prompt": None,
+                "workflow": "/home/user/.config/darkwall-comfyui/workflows/default.json",
+            })))
+        
+        first, second = load(), load()
+        assert first.positive_prompt is second.positive_prompt
+        assert first.workflow is second.workflow
+        assert first.negative_prompt is None
 
 
 # TEAM_003: Removed TestCleanupPolicy class
@@ -315,6 +349,89 @@ class TestWallpaperHistory:
         # Entries may or may not be deleted depending on implementation
         assert len(history._entries) >= 0
     
+    def test_cleanup_deletes_in_bulk(self, history_config, mock_generation_result, mock_prompt_result):
+        """Condemned entries are removed together with a single index write."""
+        history = WallpaperHistory(history_config)
+        entries = [
+            history.save_wallpaper(
+                image_data=f"test{i}".encode(),
+                generation_result=mock_generation_result,
+                prompt_result=mock_prompt_result,
+                monitor_index=i
+            )
+            for i in range(4)
+        ]
+        
+        with patch.object(history, '_save_index', wraps=history._save_index) as save_index:
+            assert history.cleanup(CleanupPolicy(max_count=1)) == 3
+        
+        save_index.assert_called_once()
+        assert history._entries == [entries[-1]]
+        assert list(history._by_timestamp) == [entries[-1].timestamp]
+        assert not (history.history_dir / entries[0].path).exists()
+        assert (history.history_dir / entries[-1].path).exists()
+    
+    def test_cleanup_unlinks_large_batches_in_threads(self, history_config, mock_generation_result, mock_prompt_result):
+        """Batches above the threshold are unlinked through the thread pool."""
+        history = WallpaperHistory(history_config)
+        entries = [
+            history.save_wallpaper(
+                image_data=f"test{i}".encode(),
+                generation_result=mock_generation_result,
+                prompt_result=mock_prompt_result,
+                monitor_index=i
+            )
+            for i in range(CLEANUP_UNLINK_MIN_BATCH + 2)
+        ]
+        
+        assert history.cleanup(CleanupPolicy(max_count=1)) == len(entries) - 1
+        assert history._entries == [entries[-1]]
+        assert [p.name for p in history.history_dir.rglob("*.png")] == [entries[-1].filename]
+    
+    def _entry(self, timestamp, favorite=False, file_size=1024 * 1024):
+        """Build an index entry without an image file."""
+        return HistoryEntry(
+            timestamp=timestamp,
+            filename="test.png",
+            path=f"{timestamp}.png",
+            monitor_index=0,
+            prompt_id="test-prompt-id",
+            positive_prompt="test prompt",
+            file_size=file_size,
+            favorite=favorite,
+        )
+    
+    def test_cleanup_policy_count_keeps_favorites(self, history_config):
+        """max_count keeps the newest entries, min_favorites protects favorites."""
+        history = WallpaperHistory(history_config)
+        history._entries = [
+            self._entry("2025-01-01T00:00:00", favorite=True),
+            self._entry("2025-01-02T00:00:00"),
+            self._entry("2025-01-03T00:00:00"),
+            self._entry("2025-01-04T00:00:00"),
+        ]
+        
+        condemned = history._select_for_cleanup(CleanupPolicy(max_count=2, min_favorites=1))
+        
+        assert [e.timestamp for e in condemned] == ["2025-01-02T00:00:00"]
+    
+    def test_cleanup_policy_size_and_age(self, history_config):
+        """max_size_mb and max_days drop the oldest entries first."""
+        history = WallpaperHistory(history_config)
+        now = datetime.now()
+        history._entries = [
+            self._entry((now - timedelta(days=10)).isoformat()),
+            self._entry((now - timedelta(days=2)).isoformat()),
+            self._entry((now - timedelta(days=1)).isoformat()),
+            self._entry(now.isoformat()),
+        ]
+        
+        by_size = history._select_for_cleanup(CleanupPolicy(max_size_mb=2))
+        assert by_size == history._entries[1::-1]
+        
+        by_age = history._select_for_cleanup(CleanupPolicy(max_days=5))
+        assert by_age == [history._entries[0]]
+    
     def test_persistence(self, history_config, mock_generation_result, mock_prompt_result):
         """Test that history persists across instances."""
         # Create first instance and save data
@@ -339,6 +456,111 @@ class TestWallpaperHistory:
         assert len(index_data) == 1
         assert index_data[0]['timestamp'] == entry.timestamp
 
+    def test_unsorted_index_lists_newest_first(self, history_config, temp_history_dir):
+        """An out-of-order index on disk is still listed newest first."""
+        base = {"filename": "x.png", "path": "x.png", "monitor_index": 0,
+                "prompt_id": "id", "positive_prompt": "p"}
+        index = [dict(base, timestamp=ts) for ts in
+                 ("2025-01-02T00:00:00", "2025-01-03T00:00:00", "2025-01-01T00:00:00")]
+        (temp_history_dir / "index.json").write_text(json.dumps(index))
+        
+        history = WallpaperHistory(history_config)
+        
+        assert [e.timestamp for e in history.list_entries()] == [
+            "2025-01-03T00:00:00", "2025-01-02T00:00:00", "2025-01-01T00:00:00"]
+        assert [e.timestamp for e in history.list_entries(limit=1)] == ["2025-01-03T00:00:00"]
+        assert history.get_entry("2025-01-01T00:00:00").timestamp == "2025-01-01T00:00:00"
+
+    def test_journal_replay_and_compaction(self, history_config, temp_history_dir,
+                                           mock_generation_result, mock_prompt_result):
+        """Small changes are journaled, replayed on load, then compacted."""
+        base = {"filename": "x.png", "path": "x.png", "monitor_index": 0,
+                "prompt_id": "id", "positive_prompt": "p"}
+        index = [dict(base, timestamp=f"2025-01-0{i}T00:00:00") for i in range(1, 9)]
+        (temp_history_dir / "index.json").write_text(json.dumps(index))
+        history_config.max_entries = 100
+        
+        history = WallpaperHistory(history_config)
+        entry = history.save_wallpaper(
+            image_data=b"test",
+            generation_result=mock_generation_result,
+            prompt_result=mock_prompt_result,
+            monitor_index=0
+        )
+        history.set_favorite("2025-01-01T00:00:00", True)
+        
+        # Both changes went to the journal; the snapshot is untouched
+        assert history.journal_file.exists()
+        assert len(json.loads(history.index_file.read_text())) == 8
+        
+        reloaded = WallpaperHistory(history_config)
+        assert len(reloaded._entries) == 9
+        assert reloaded.get_entry(entry.timestamp) is not None
+        assert reloaded.get_entry("2025-01-01T00:00:00").favorite is True
+        
+        # The next change exceeds the journal budget and rewrites the index
+        reloaded.delete_entry("2025-01-02T00:00:00")
+        assert not reloaded.journal_file.exists()
+        index_data = json.loads(reloaded.index_file.read_text())
+        assert len(index_data) == 8
+        assert entry.timestamp in {e["timestamp"] for e in index_data}
+
+    def test_stale_journal_after_crash_is_not_replayed(self, history_config, temp_history_dir,
+                                                       mock_generation_result, mock_prompt_result):
+        """A journal that outlived its index rewrite does not undo later changes."""
+        base = {"filename": "x.png", "path": "x.png", "monitor_index": 0,
+                "prompt_id": "id", "positive_prompt": "p"}
+        index = [dict(base, timestamp=f"2025-01-0{i}T00:00:00") for i in range(1, 9)]
+        (temp_history_dir / "index.json").write_text(json.dumps(index))
+        history_config.max_entries = 100
+        
+        history = WallpaperHistory(history_config)
+        history.set_favorite("2025-01-01T00:00:00", True)
+        entry = history.save_wallpaper(
+            image_data=b"test",
+            generation_result=mock_generation_result,
+            prompt_result=mock_prompt_result,
+            monitor_index=0
+        )
+        
+        # Undo both in memory, then crash after index.json is swapped in
+        # but before the journal is removed
+        history.get_entry("2025-01-01T00:00:00").favorite = False
+        history._entries.remove(entry)
+        del history._by_timestamp[entry.timestamp]
+        with patch.object(history, '_discard_journal'):
+            history._save_index()
+        assert history.journal_file.exists()
+        
+        reloaded = WallpaperHistory(history_config)
+        assert reloaded.get_entry("2025-01-01T00:00:00").favorite is False
+        assert reloaded.get_entry(entry.timestamp) is None
+        assert not reloaded.journal_file.exists()
+        
+        # A new journal starts cleanly against the rewritten index
+        reloaded.set_favorite("2025-01-02T00:00:00", True)
+        assert WallpaperHistory(history_config).get_entry("2025-01-02T00:00:00").favorite is True
+
+    def test_index_rewrite_is_atomic_with_daily_backup(self, history_config,
+                                                       mock_generation_result, mock_prompt_result):
+        """Index rewrites leave no temp file and refresh a stale backup only."""
+        history = WallpaperHistory(history_config)
+        for i in range(2):
+            history.save_wallpaper(
+                image_data=f"test{i}".encode(),
+                generation_result=mock_generation_result,
+                prompt_result=mock_prompt_result,
+                monitor_index=0
+            )
+        
+        backup_file = history.index_file.with_suffix('.json.bak')
+        assert not history.index_file.with_suffix('.json.tmp').exists()
+        # The first rewrite had no index to back up; the second did
+        assert len(json.loads(backup_file.read_text())) == 1
+        
+        history._save_index()
+        assert len(json.loads(backup_file.read_text())) == 1
+
 
 # TEAM_003: Removed TestHistoryIntegration class
 # The old test used deprecated Config class with index-based monitors.
@@ -0,0 +1,83 @@
+"""Tests for compositor detection internals."""
+
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from darkwall_comfyui.exceptions import CompositorNotFoundError
+from darkwall_comfyui.monitor_detection import MonitorDetector
+
+
+@pytest.fixture
+def no_compositor_env(monkeypatch):
+    """Unset the variables compositors export to their clients."""
+    for name in ("NIRI_SOCKET", "SWAYSOCK", "HYPRLAND_INSTANCE_SIGNATURE"):
+        monkeypatch.delenv(name, raising=False)
+
+
+class TestIsRunning:
+    """Test process lookup used to detect the compositor."""
+
+    def test_compositor_socket_short_circuits(self, monkeypatch, tmp_path: Path):
+        """A compositor variable naming an existing socket skips the process scan."""
+        socket = tmp_path / "sway-ipc.sock"
+        socket.touch()
+        monkeypatch.setenv("SWAYSOCK", str(socket))
+
+        def no_scan(path):
+            raise AssertionError("/proc should not be scanned")
+
+        monkeypatch.setattr(os, "scandir", no_scan)
+        assert MonitorDetector()._is_running("sway")
+
+    def test_stale_compositor_variable_is_not_trusted(self, no_compositor_env, monkeypatch, tmp_path: Path):
+        """A leftover variable whose socket is gone falls through to the scan."""
+        monkeypatch.setenv("NIRI_SOCKET", str(tmp_path / "niri.wayland-1.sock"))
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        monkeypatch.setenv("HYPRLAND_INSTANCE_SIGNATURE", "abc123")
+
+        detector = MonitorDetector()
+        with patch.object(detector, "_scan_process_names", return_value=frozenset({"bash"})):
+            assert not detector._is_running("niri")
+            assert not detector._is_running("Hyprland")
+
+            hypr_socket = tmp_path / "hypr" / "abc123" / ".socket.sock"
+            hypr_socket.parent.mkdir(parents=True)
+            hypr_socket.touch()
+            assert detector._is_running("Hyprland")
+
+    def test_scans_proc_comm(self, no_compositor_env):
+        """Without the variable, /proc/*/comm is matched exactly."""
+        own_comm = Path(f"/proc/{os.getpid()}/comm").read_text().rstrip("\n")
+
+        detector = MonitorDetector()
+        assert detector._is_running(own_comm)
+        assert not detector._is_running(own_comm[:-1] + "\x01")
+        assert not detector._is_running("niri-no-such-process")
+
+    def test_detection_scans_proc_once(self, no_compositor_env):
+        """All compositor checks of one detection share a single /proc scan."""
+        detector = MonitorDetector()
+        with patch.object(detector, "_scan_process_names",
+                          return_value=frozenset({"bash"})) as scan:
+            with pytest.raises(CompositorNotFoundError):
+                detector._detect_compositor()
+            with pytest.raises(CompositorNotFoundError):
+                detector._detect_compositor()
+
+        assert scan.call_count == 2
+
+    def test_falls_back_to_pgrep_without_proc(self, no_compositor_env, monkeypatch):
+        """Where /proc cannot be read, pgrep -x is asked instead."""
+        def no_proc(path):
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr(os, "scandir", no_proc)
+        with patch("darkwall_comfyui.monitor_detection.subprocess.run",
+                   return_value=Mock(returncode=0)) as run:
+            assert MonitorDetector()._is_running("niri")
+
+        run.assert_called_once()
+        assert run.call_args.args[0] == ["pgrep", "-x", "niri"]
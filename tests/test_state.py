@@ -0,0 +1,77 @@
+"""Tests for NamedStateManager persistence."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from darkwall_comfyui.config import NamedStateManager
+from darkwall_comfyui.exceptions import StateError
+
+
+@pytest.fixture
+def state_mgr(tmp_path: Path, monkeypatch) -> NamedStateManager:
+    """Create a state manager writing into a temporary config dir."""
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    return NamedStateManager(["DP-1", "HDMI-A-1"])
+
+
+class TestStatePersistence:
+    """Test state file reads and writes."""
+
+    def test_save_is_atomic_and_readable(self, state_mgr):
+        """State is written via a temp file that does not linger."""
+        state_mgr.save_state({'last_monitor': "DP-1", 'rotation_count': 3})
+
+        assert json.loads(state_mgr.state_file.read_text())['rotation_count'] == 3
+        assert not state_mgr.state_file.with_suffix('.json.tmp').exists()
+
+    def test_rotation_round_trip(self, state_mgr):
+        """Rotation advances through monitors and persists between instances."""
+        assert state_mgr.get_next_monitor() == "DP-1"
+        assert state_mgr.get_next_monitor() == "HDMI-A-1"
+
+        reloaded = NamedStateManager(["DP-1", "HDMI-A-1"])
+        assert reloaded.peek_next_monitor() == "DP-1"
+        assert reloaded.get_state()['rotation_count'] == 2
+
+    def test_corrupt_state_falls_back_to_defaults(self, state_mgr):
+        """An unreadable state file is treated as fresh state."""
+        state_mgr.state_file.parent.mkdir(parents=True, exist_ok=True)
+        state_mgr.state_file.write_text("{not json")
+
+        assert state_mgr.get_state()['last_monitor'] is None
+
+    def test_state_file_read_once_per_instance(self, state_mgr):
+        """Rotation reuses the in-memory state instead of re-reading the file."""
+        state_mgr.get_next_monitor()
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(state_mgr, "_read_state", lambda: pytest.fail("state re-read"))
+            assert state_mgr.peek_next_monitor() == "HDMI-A-1"
+            assert state_mgr.get_next_monitor() == "HDMI-A-1"
+
+    def test_unchanged_state_is_not_rewritten(self, state_mgr):
+        """Saving identical state leaves the existing file untouched."""
+        state_mgr.reset_rotation()
+        mtime = state_mgr.state_file.stat().st_mtime_ns
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("os.replace", lambda *a: pytest.fail("state rewritten"))
+            state_mgr.reset_rotation()
+        assert state_mgr.state_file.stat().st_mtime_ns == mtime
+
+    def test_failed_save_leaves_rotation_unchanged(self, state_mgr):
+        """A rotation whose state cannot be written is not kept in memory."""
+        assert state_mgr.get_next_monitor() == "DP-1"
+
+        with pytest.MonkeyPatch.context() as mp:
+            def fail_replace(*args):
+                raise OSError("No space left on device")
+
+            mp.setattr("os.replace", fail_replace)
+            with pytest.raises(StateError):
+                state_mgr.get_next_monitor()
+
+        assert state_mgr.peek_next_monitor() == "HDMI-A-1"
+        assert state_mgr.get_state()['rotation_count'] == 1